@@ -0,0 +1,221 @@
+from flask import Blueprint, jsonify, request
+
+from extensions import db
+from models import State, StateStats, DistrictStats, DistrictAccessibility
+from data_version import get_data_version
+
+# The services.* modules behind the analytics endpoints (inequality,
+# accessibility, coverage) need numpy or scipy and are imported inside the
+# views that use them, so workers serving only JSON listings never load them.
+
+api_analytics = Blueprint("api_analytics", __name__, url_prefix="/api/analytics")
+
+# Results computed for the current data version, keyed by request params.
+# Dropped as a whole when state, district_stats or state_stats is reloaded.
+_inequality_cache = {"version": None, "results": {}}
+
+INEQUALITY_LEVELS = ("district", "state")
+
+
+# Population units for the inequality metrics: (population, beds, hospitals) per
+# district of one state / of India, or per state of India. Units without
+# population are left out since they have no per-capita value.
+def inequality_units(level, state_id=None):
+    if level == "district":
+        query = (
+            db.session.query(
+                DistrictStats.total_persons.label("population"),
+                DistrictStats.total_beds.label("beds"),
+                DistrictStats.num_hospitals.label("hospitals"),
+            )
+            .filter(DistrictStats.total_persons > 0)
+        )
+        if state_id:
+            query = query.filter(DistrictStats.state_id == state_id)
+        return query.all()
+
+    return (
+        db.session.query(
+            StateStats.total_persons.label("population"),
+            StateStats.total_beds.label("beds"),
+            StateStats.num_hospitals.label("hospitals"),
+        )
+        .filter(StateStats.total_persons > 0)
+        .all()
+    )
+
+
+# GET /api/analytics/inequality
+# Gini and Theil indices and Lorenz curves of beds and hospitals per capita.
+# Query:
+#   - level    (str, optional): "district" (default) compares districts, "state" compares states across India.
+#   - state_id (int, optional): With level=district, only districts of this state; otherwise all districts in India.
+@api_analytics.route("/inequality", methods=["GET"])
+def get_inequality():
+    from services.inequality import inequality_summary
+
+    level = (request.args.get("level") or "district").strip().lower()
+    state_id = request.args.get("state_id", type=int)
+
+    if level not in INEQUALITY_LEVELS:
+        return jsonify({"error": f"level must be one of: {', '.join(INEQUALITY_LEVELS)}"}), 400
+    if level == "state":
+        state_id = None
+
+    version = get_data_version("state", "district_stats", "state_stats")
+    if _inequality_cache["version"] != version:
+        _inequality_cache["version"] = version
+        _inequality_cache["results"] = {}
+
+    key = (level, state_id)
+    result = _inequality_cache["results"].get(key)
+
+    if result is None:
+        rows = inequality_units(level, state_id)
+        if not rows:
+            msg = "No population data found"
+            if state_id is not None:
+                msg += f" for state_id {state_id}"
+            return jsonify({"message": msg}), 404
+
+        state = db.session.get(State, state_id) if state_id else None
+        population = [r.population for r in rows]
+        result = {
+            "level": level,
+            "state_id": state_id,
+            "state_name": state.state_name if state else None,
+            "units": len(rows),
+            "population": int(sum(population)),
+            "metrics": {
+                "beds": inequality_summary([r.beds for r in rows], population, per=10000),
+                "hospitals": inequality_summary([r.hospitals for r in rows], population, per=100000),
+            },
+        }
+        _inequality_cache["results"][key] = result
+
+    return jsonify({"data": result}), 200
+
+
+# GET /api/analytics/accessibility
+# Distance from each district's centroid to its nearest hospitals, with a
+# population-weighted summary. Precomputed by seed/06_compute_accessibility.py.
+# Query:
+#   - state_id (int, optional): Only districts of this state; otherwise all districts.
+#   - scope    (str, optional): "all" (default), "type:<hospital_type>" or "category:<category_id>".
+@api_analytics.route("/accessibility", methods=["GET"])
+def get_accessibility():
+    from services.accessibility import population_weighted_km
+
+    state_id = request.args.get("state_id", type=int)
+    scope = (request.args.get("scope") or "all").strip()
+
+    query = DistrictAccessibility.query.filter_by(scope=scope)
+    if state_id:
+        query = query.filter_by(state_id=state_id)
+
+    rows = query.order_by(DistrictAccessibility.district_name).all()
+
+    if not rows:
+        msg = f"No accessibility data found for scope '{scope}'"
+        if state_id is not None:
+            msg += f" and state_id {state_id}"
+        return jsonify({"message": msg, "count": 0, "data": []}), 404
+
+    return jsonify({
+        "count": len(rows),
+        "summary": {
+            "scope": scope,
+            "state_id": state_id,
+            "n_nearest": rows[0].n_nearest,
+            "radius_km": rows[0].radius_km,
+            "population_weighted_nearest_km": population_weighted_km(rows, "nearest_km"),
+            "population_weighted_mean_nearest_km": population_weighted_km(rows, "mean_nearest_km"),
+            "districts_without_facility": sum(1 for r in rows if r.nearest_km is None),
+            "districts_without_facility_in_radius": sum(1 for r in rows if r.hospitals_within_radius == 0),
+        },
+        "data": [r.to_dict() for r in rows],
+    }), 200
+
+
+# GET /api/analytics/states
+# Precomputed per-state rollups (districts, hospitals, beds, hospitals by type, population, ratios)
+# for cross-state comparison, plus national totals.
+# Query:
+#   - state_id (int, optional): Only this state.
+@api_analytics.route("/states", methods=["GET"])
+def get_state_rollups():
+    state_id = request.args.get("state_id", type=int)
+
+    query = StateStats.query
+    if state_id:
+        query = query.filter_by(state_id=state_id)
+
+    rows = query.order_by(StateStats.state_name.asc()).all()
+
+    if not rows:
+        return jsonify({"message": "No state stats found", "count": 0, "data": []}), 404
+
+    population = sum(r.total_persons or 0 for r in rows)
+    beds = sum(r.total_beds for r in rows)
+    hospitals = sum(r.num_hospitals for r in rows)
+
+    return jsonify({
+        "count": len(rows),
+        "totals": {
+            "num_districts": sum(r.num_districts for r in rows),
+            "num_hospitals": hospitals,
+            "total_beds": beds,
+            "total_persons": population,
+            "beds_per_10k": beds * 10000.0 / population if population else 0,
+            "hospitals_per_100k": hospitals * 100000.0 / population if population else 0,
+        },
+        "data": [r.to_dict() for r in rows],
+    }), 200
+
+
+
+# GET /api/analytics/coverage
+# District x category coverage from the in-memory sparse coverage matrix.
+# Without category_id: per-category hospitals, beds and number of districts with/without a facility.
+# With category_id: per-district hospitals and beds offering that category, and per-capita values.
+# Query:
+#   - category_id (int, optional): Category to break down by district.
+#   - state_id    (int, optional): Only districts of this state; otherwise all districts.
+#   - per         (int, optional): Population unit for per-capita values (default 100000).
+#   - missing     (bool, optional): With category_id, only districts without any such facility.
+@api_analytics.route("/coverage", methods=["GET"])
+def get_coverage():
+    from services.coverage import get_coverage_matrix
+
+    category_id = request.args.get("category_id", type=int)
+    state_id = request.args.get("state_id", type=int)
+    per = request.args.get("per", default=100000, type=int)
+    missing = (request.args.get("missing") or "").strip().lower() in ("1", "true", "yes")
+
+    if per <= 0:
+        return jsonify({"error": "per must be a positive integer"}), 400
+
+    matrix = get_coverage_matrix()
+
+    if category_id is None:
+        return jsonify({
+            "state_id": state_id,
+            "districts": len(matrix.district_rows(state_id)),
+            "count": len(matrix.categories),
+            "data": matrix.category_summary(state_id),
+        }), 200
+
+    if matrix.category_col(category_id) is None:
+        return jsonify({"error": f"Category {category_id} not found"}), 404
+
+    rows = matrix.category_coverage(category_id, state_id, per=per)
+    if missing:
+        rows = [r for r in rows if r["hospitals"] == 0]
+
+    return jsonify({
+        "category_id": category_id,
+        "state_id": state_id,
+        "per": per,
+        "count": len(rows),
+        "data": rows,
+    }), 200
@@ -1,16 +1,18 @@
 from flask import Blueprint, jsonify, request
-from sqlalchemy.orm import joinedload
 
-from extensions import db
-from models import State, District, Hospital
+from models import DistrictStats
+from conditional_get import versioned
+from services.reference_data import REFERENCE_TABLES, get_reference_data
+from services.fieldsets import parse_fields, project
 
 api_base = Blueprint("api", __name__, url_prefix="/api")
 
-def serialize_district(d: District):
-    return {
-        **d.to_dict(),
-        "state_name": d.state.state_name if d.state else None
-    }
+# Fields selectable on /api/districts (District.to_dict() plus state_name)
+DISTRICT_FIELDS = (
+    "district_id", "district_name", "state_id", "state_name", "latitude", "longitude",
+    "total_persons", "total_males", "total_females",
+    "children_persons", "children_males", "children_females",
+)
 
 @api_base.route("/health", methods=["GET"])
 def health():
@@ -23,38 +25,37 @@ def echo():
 
 # GET /api/states
 # Retrieve a list of all states available in the system.
+# Served from the in-memory reference data (services.reference_data).
 @api_base.route("/states", methods=["GET"])
+@versioned(*REFERENCE_TABLES)
 def get_states():
-    states = State.query.order_by(State.state_name.asc()).all()
+    ref = get_reference_data()
 
-    return jsonify({
-        "count": len(states),
-        "data": [s.to_dict() for s in states]
-    }), 200
+    return ref.response("states", lambda: {
+        "count": len(ref.states),
+        "data": ref.states,
+    })
 
 # GET /api/districts
 # Retrieve districts(with population data) either for a specific state or for all states or specific district accoring to disctrict id.
+# Served from the in-memory reference data (services.reference_data).
 # Query Parameters:
 #   - state_id (int, optional): If provided, returns districts belonging only to that state. If omitted, returns all districts across all states.
 #   - district_id (int, optional): If provided, returns specific district If omitted, returns all districts across state.
+#   - fields (str, optional): Comma separated district fields to return, e.g. district_id,district_name.
 @api_base.route("/districts", methods=["GET"])
+@versioned(*REFERENCE_TABLES)
 def get_districts():
     state_id = request.args.get("state_id", type=int)
     district_id = request.args.get("district_id", type=int)
 
-    query = (
-        District.query
-        .options(
-            joinedload(District.state),
-        )
-    )
-
-    if state_id:
-        query = query.filter_by(state_id=state_id)
-    if district_id:
-        query = query.filter_by(district_id=district_id)
+    try:
+        fields = parse_fields(request.args.get("fields"), DISTRICT_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    districts = query.order_by(District.state_id.asc(), District.district_id.asc()).all()
+    ref = get_reference_data()
+    districts = ref.find_districts(state_id, district_id)
 
     if not districts:
         msg = "No districts found"
@@ -64,8 +65,56 @@ def get_districts():
             msg += f", district_id {district_id}"
         return jsonify({"message": msg, "count": 0, "data": []}), 404
 
-    return jsonify({
+    # Projections are cheap to build and only whole rows are memoized, so the
+    # cache holds at most one body per state or district
+    if fields is not None:
+        return jsonify({
+            "count": len(districts),
+            "data": [project(d, fields) for d in districts],
+        }), 200
+
+    key = ("districts", state_id or None, district_id or None)
+    return ref.response(key, lambda: {
         "count": len(districts),
-        "data": [serialize_district(d) for d in districts],
-    }), 200
+        "data": districts,
+    })
 
+# GET /api/categories
+# Retrieve all hospital categories (specialities), ordered by name.
+# Served from the in-memory reference data (services.reference_data).
+@api_base.route("/categories", methods=["GET"])
+@versioned(*REFERENCE_TABLES)
+def get_categories():
+    ref = get_reference_data()
+
+    return ref.response("categories", lambda: {
+        "count": len(ref.categories),
+        "data": ref.categories,
+    })
+
+# GET /api/districts/stats
+# Precomputed per-district statistics (hospital count, beds, hospitals by type, population, ratios).
+# Query Parameters:
+#   - state_id (int, optional): Only districts of this state.
+#   - district_id (int, optional): Only this district.
+@api_base.route("/districts/stats", methods=["GET"])
+@versioned("district_stats")
+def get_district_stats():
+    state_id = request.args.get("state_id", type=int)
+    district_id = request.args.get("district_id", type=int)
+
+    query = DistrictStats.query
+    if state_id:
+        query = query.filter_by(state_id=state_id)
+    if district_id:
+        query = query.filter_by(district_id=district_id)
+
+    stats = query.order_by(DistrictStats.state_id.asc(), DistrictStats.district_id.asc()).all()
+
+    if not stats:
+        return jsonify({"message": "No district stats found", "count": 0, "data": []}), 404
+
+    return jsonify({
+        "count": len(stats),
+        "data": [s.to_dict() for s in stats],
+    }), 200
@@ -1,33 +1,44 @@
-from flask import Blueprint, send_file, request, jsonify
-from io import BytesIO
+from flask import Blueprint, request, jsonify, make_response, current_app
+from functools import wraps
+import math
+from hashlib import sha1
 
-import matplotlib
-import numpy as np
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
 
 from extensions import db
-from models import State, District, Hospital
-from sqlalchemy import func
+from models import Hospital, StateStats, DistrictStats, DistrictAccessibility
+from sqlalchemy import func, cast, Float
+from data_version import get_data_version
+from services.chart_cache import get_chart_cache
+from services.chart_renderer import render_chart, RenderBusy, RenderTimeout
+from services.prerendered import get_prerendered
 
 api_charts = Blueprint("api_charts", __name__, url_prefix="/api/charts")
 
-# Returns PNG response from Matplotlib figure
-def fig_to_png_response(fig):
-    buf = BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return send_file(buf, mimetype="image/png")
+# Tables whose contents feed the charts; a reload of any of them changes the cache key
+CHART_TABLES = ("state", "district", "hospital", "district_stats", "state_stats", "district_accessibility")
+
+MAX_HIST_BINS = 500
+
+@api_charts.errorhandler(RenderBusy)
+def render_busy(e):
+    response = jsonify({"error": "Chart renderer is busy, try again shortly"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+@api_charts.errorhandler(RenderTimeout)
+def render_timeout(e):
+    return jsonify({"error": "Chart rendering timed out"}), 504
 
 # Validate a color string (name or hex), return RGBA or None
 def validate_color(color):
     if not color:
         return None
+    # Imported here so the API process only loads Matplotlib once a chart is requested
+    from matplotlib.colors import to_rgba
+
     color = color.strip()
     try:
-        rgba = mcolors.to_rgba(color)
+        rgba = to_rgba(color)
         return rgba
     except ValueError:
         return None
@@ -47,348 +58,518 @@ def get_bg_color(default="white"):
     color = request.args.get("bg_color")
     return validate_color(color) or default
 
-# Get figure size using ?w= & ?h= params (default=(12,7))
+# Get figure size in inches using ?w= & ?h= params (default=(12,7)),
+# clamped to 1..CHART_MAX_WIDTH / CHART_MAX_HEIGHT
 def get_figsize(default=(12, 7)):
-    w = request.args.get("w")
-    h = request.args.get("h")
-    if w and h:
-        return (int(w), int(h))
-    return default
+    w = request.args.get("w", type=int)
+    h = request.args.get("h", type=int)
+    if not (w and h):
+        return default
+
+    config = current_app.config
+    return (
+        max(1, min(w, config.get("CHART_MAX_WIDTH", 24))),
+        max(1, min(h, config.get("CHART_MAX_HEIGHT", 24))),
+    )
 
+# Get resolution from ?dpi= param (default=CHART_DEFAULT_DPI), clamped to CHART_MIN_DPI..CHART_MAX_DPI
+def get_dpi():
+    config = current_app.config
+    dpi = request.args.get("dpi", type=int) or config.get("CHART_DEFAULT_DPI", 100)
+    return max(config.get("CHART_MIN_DPI", 20), min(dpi, config.get("CHART_MAX_DPI", 300)))
+
+# Estimated size in bytes of the RGBA raster Agg allocates for the requested figure
+def estimate_render_bytes(size, dpi):
+    w, h = size
+    return int(w * dpi) * int(h * dpi) * 4
+
+# Get output format from ?format= param (default=png)
+def get_format(default="png"):
+    return (request.args.get("format") or default).strip().lower()
+
+# Get render variant from ?variant= param: full (default) or thumb
+def get_variant(default="full"):
+    return (request.args.get("variant") or default).strip().lower()
+
+# Style part of a render spec, taken from the request params.
+# The thumb variant uses a fixed small size and low DPI (w/h/dpi are ignored)
+# and skips the tight-bbox layout pass and scatter labels.
+def chart_style():
+    config = current_app.config
+    thumb = get_variant() == "thumb"
+    return {
+        "size": tuple(config.get("CHART_THUMB_SIZE", (4, 3))) if thumb else get_figsize(),
+        "dpi": config.get("CHART_THUMB_DPI", 50) if thumb else get_dpi(),
+        "thumb": thumb,
+        "color": get_color(),
+        "text_color": get_text_color(),
+        "bg_color": get_bg_color(),
+    }
+
+# Cache key for the current chart request: route + format + normalized params + data version.
+# Colors and size go through the same helpers the views use, so "red", "#ff0000"
+# and "RED" share one entry. Style params are dropped for JSON, which ignores them.
+# Unknown params are kept verbatim.
+def chart_cache_key(fmt):
+    style = sorted(chart_style().items()) if fmt != "json" else None
+    skip = {"w", "h", "dpi", "variant", "color", "text_color", "bg_color", "format"}
+    extra = sorted((k, v) for k, v in request.args.items(multi=True) if k not in skip)
+
+    return repr((
+        request.path,
+        fmt,
+        style,
+        extra,
+        get_data_version(*CHART_TABLES),
+    ))
+
+# Turn a chart series into response bytes in the requested format
+def encode_chart(series, fmt):
+    if fmt == "json":
+        return current_app.json.dumps(series).encode("utf-8")
+    return render_chart({**chart_style(), **series, "format": fmt})
+
+CHART_FORMATS = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+}
+
+# Formats rendered through an Agg raster, subject to CHART_MAX_RENDER_BYTES
+RASTER_FORMATS = ("png", "webp")
+
+CHART_VARIANTS = ("full", "thumb")
+
+# Wraps a chart view with output formats, the LRU cache and conditional GET.
+# Views only run the query and return the chart series (kind, labels, values, ...)
+# or an error response; the same series is rendered (?format=png|webp|svg,
+# ?variant=full|thumb) or sent as JSON (?format=json), so the image and the data
+# can't disagree.
+# Charts written by seed/07_prerender_charts.py are served from disk on a miss.
+# The ETag is derived from the cache key: the key pins every render input and the
+# data version, so equal keys always produce the same bytes. That lets any worker
+# answer If-None-Match with 304 without touching the database or the renderer.
+def cached_chart(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        fmt = get_format()
+        if fmt not in CHART_FORMATS:
+            return jsonify({"error": f"Unsupported format '{fmt}'. Use one of: {', '.join(CHART_FORMATS)}"}), 400
+        if get_variant() not in CHART_VARIANTS:
+            return jsonify({"error": f"Unsupported variant. Use one of: {', '.join(CHART_VARIANTS)}"}), 400
+
+        if fmt in RASTER_FORMATS:
+            style = chart_style()
+            budget = current_app.config.get("CHART_MAX_RENDER_BYTES", 64 * 1024 * 1024)
+            needed = estimate_render_bytes(style["size"], style["dpi"])
+            if needed > budget:
+                return jsonify({
+                    "error": f"Requested chart needs ~{needed // (1024 * 1024)} MB to render, "
+                             f"over the {budget // (1024 * 1024)} MB limit. Lower w, h or dpi."
+                }), 413
+
+        key = chart_cache_key(fmt)
+        etag = sha1(key.encode("utf-8")).hexdigest()
+
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+        else:
+            cache = get_chart_cache()
+            entry = cache.get(key)
+            if entry is None:
+                prerendered = get_prerendered(key)
+                if prerendered is not None:
+                    entry = cache.put(key, *prerendered)
+            if entry is None:
+                series = view(*args, **kwargs)
+                if not isinstance(series, dict):
+                    return series
+                entry = cache.put(key, encode_chart(series, fmt), CHART_FORMATS[fmt])
+
+            response = make_response(entry["body"])
+            response.mimetype = entry["mimetype"]
+
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    return wrapper
+
+
+# Histogram buckets computed in PostgreSQL with width_bucket(); only the
+# per-bucket counts come back, so the payload is O(bins) whatever the table size.
+# Follows numpy.histogram conventions: equal-width bins over [lo, hi], last bin
+# closed, missing bounds taken from the data. Returns None if no hospital
+# matches the filters; raises ValueError if a given bound leaves an empty range
+# (e.g. min not below the largest value).
+def beds_histogram(bins, lo=None, hi=None, state_id=None, district_id=None, hospital_type=None):
+    beds = cast(Hospital.total_beds, Float)
+
+    filters = [Hospital.total_beds.isnot(None)]
+    if state_id is not None:
+        filters.append(Hospital.state_id == state_id)
+    if district_id is not None:
+        filters.append(Hospital.district_id == district_id)
+    if hospital_type:
+        filters.append(Hospital.hospital_type == hospital_type)
+
+    data_lo, data_hi = db.session.query(func.min(beds), func.max(beds)).filter(*filters).one()
+    if data_lo is None:
+        return None
 
-# GET /api/charts/beds  
-# Histogram of beds per hospital
-# Params: w,h,color,text_color,bg_color
-@api_charts.route("/beds", methods=["GET"])
-def beds():
+    if lo is None and hi is None:
+        lo, hi = data_lo, data_hi
+        if lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+    elif lo is None:
+        if hi <= data_lo:
+            raise ValueError(f"max ({hi:g}) must be greater than the smallest matching bed count ({data_lo:g})")
+        lo = data_lo
+    elif hi is None:
+        if lo >= data_hi:
+            raise ValueError(f"min ({lo:g}) must be less than the largest matching bed count ({data_hi:g})")
+        hi = data_hi
+    if lo >= hi:
+        raise ValueError("min must be less than max")
+
+    bucket = func.least(func.width_bucket(beds, lo, hi, bins), bins).label("bucket")
     rows = (
-        db.session.query(Hospital.total_beds)
-        .filter(Hospital.total_beds.isnot(None))
+        db.session.query(bucket, func.count().label("num_hospitals"))
+        .filter(*filters, beds >= lo, beds <= hi)
+        .group_by(bucket)
         .all()
     )
-    beds = [r.total_beds for r in rows if r.total_beds is not None]
 
-    size = get_figsize()
-    fig, ax = plt.subplots(figsize=size)
+    counts = [0] * bins
+    for r in rows:
+        counts[r.bucket - 1] = r.num_hospitals
 
-    color = get_color()
-    text_color = get_text_color()
-    bg_color = get_bg_color()
+    step = (hi - lo) / bins
+    edges = [lo + i * step for i in range(bins)] + [hi]
+    return edges, counts
 
-    if bg_color:
-        fig.patch.set_facecolor(bg_color)
-        ax.set_facecolor(bg_color)
 
-    ax.hist(beds, bins=50, color=color)
+# GET /api/charts/beds  
+# Histogram of beds per hospital
+# Params: w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb),
+#         bins (int, default 50, max 500), min & max (float, histogram range; default data range),
+#         state_id, district_id, hospital_type (optional filters)
+@api_charts.route("/beds", methods=["GET"])
+@cached_chart
+def beds():
+    try:
+        bins = int(request.args.get("bins", 50))
+    except ValueError:
+        return jsonify({"error": f"bins must be an integer between 1 and {MAX_HIST_BINS}"}), 400
+    try:
+        lo, hi = (float(request.args[k]) if k in request.args else None for k in ("min", "max"))
+    except ValueError:
+        return jsonify({"error": "min and max must be numbers"}), 400
 
-    ax.set_title(
-        "Number of beds vs number of hospitals", color=text_color
-    )
-    ax.set_xlabel("Number of beds", color=text_color)
-    ax.set_ylabel("Number of hospitals", color=text_color)
-    plt.setp(ax.get_xticklabels(), color=text_color)
-    plt.setp(ax.get_yticklabels(), color=text_color)
+    if not 1 <= bins <= MAX_HIST_BINS:
+        return jsonify({"error": f"bins must be between 1 and {MAX_HIST_BINS}"}), 400
+    if any(v is not None and not math.isfinite(v) for v in (lo, hi)):
+        return jsonify({"error": "min and max must be finite numbers"}), 400
+    if lo is not None and hi is not None and lo >= hi:
+        return jsonify({"error": "min must be less than max"}), 400
 
-    return fig_to_png_response(fig)
+    try:
+        histogram = beds_histogram(
+            bins,
+            lo=lo,
+            hi=hi,
+            state_id=request.args.get("state_id", type=int),
+            district_id=request.args.get("district_id", type=int),
+            hospital_type=request.args.get("hospital_type", type=str),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if histogram is None:
+        return jsonify({"error": "No hospitals with bed counts match the given filters"}), 404
+    edges, counts = histogram
+
+    return {
+        "kind": "hist",
+        "bin_edges": edges,
+        "counts": counts,
+        "title": "Number of beds vs number of hospitals",
+        "xlabel": "Number of beds",
+        "ylabel": "Number of hospitals",
+    }
+
+
+# Per-district rows of the precomputed district_stats table for one state.
+# with_hospitals=True keeps only districts that have at least one hospital.
+def district_stats_rows(state_id=None, with_hospitals=False):
+    query = DistrictStats.query
+    if state_id:
+        query = query.filter(DistrictStats.state_id == state_id)
+    if with_hospitals:
+        query = query.filter(DistrictStats.num_hospitals > 0)
+    return query.order_by(DistrictStats.district_name).all()
 
 
 # GET /api/charts/state-district-hospitals  
 # Hospitals per district
-# Params: state_id (required), w,h,color,text_color,bg_color
+# Params: state_id (required), w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
 @api_charts.route("/state-district-hospitals", methods=["GET"])
+@cached_chart
 def state_district_hospitals():
     state_id = request.args.get("state_id", type=int)
     if not state_id:
         return jsonify({"error": "state_id is required"}), 400
 
-    rows = (
-        db.session.query(
-            District.district_name,
-            func.count(Hospital.hospital_id).label("num_hospitals")
-        )
-        .join(Hospital, Hospital.district_id == District.district_id)
-        .filter(District.state_id == state_id)
-        .group_by(District.district_name)
-        .order_by(District.district_name)
-        .all()
-    )
+    rows = district_stats_rows(state_id, with_hospitals=True)
 
     if not rows:
         return jsonify({"error": "No data for given state_id"}), 404
 
-    districts = [r.district_name for r in rows]
-    num_hospitals = [r.num_hospitals for r in rows]
-
-    y = range(len(districts))
-    size = get_figsize()
-    fig, ax = plt.subplots(figsize=size)
-
-    color = get_color()
-    text_color = get_text_color()
-    bg_color = get_bg_color()
-
-    if bg_color:
-        fig.patch.set_facecolor(bg_color)
-        ax.set_facecolor(bg_color)
-
-    
-    ax.barh(y, num_hospitals, color=color)
-
-    ax.set_yticks(y)
-    ax.set_yticklabels(districts)
-    ax.invert_yaxis()
-    ax.set_xlabel("Number of hospitals", color=text_color)
-    ax.set_title(f"Number of hospitals by district", color=text_color)
-    plt.setp(ax.get_xticklabels(), color=text_color)
-    plt.setp(ax.get_yticklabels(), color=text_color)
-
-    fig.tight_layout()
-    return fig_to_png_response(fig)
+    return {
+        "kind": "barh",
+        "labels": [r.district_name for r in rows],
+        "values": [r.num_hospitals for r in rows],
+        "title": "Number of hospitals by district",
+        "xlabel": "Number of hospitals",
+    }
 
 
 # GET /api/charts/state-district-beds  
 # Total beds per district
-# Params: state_id (required), w,h,color,text_color,bg_color
+# Params: state_id (required), w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
 @api_charts.route("/state-district-beds", methods=["GET"])
+@cached_chart
 def state_district_beds():
     state_id = request.args.get("state_id", type=int)
     if not state_id:
         return jsonify({"error": "state_id is required"}), 400
 
-    rows = (
-        db.session.query(
-            District.district_name,
-            func.coalesce(func.sum(Hospital.total_beds), 0).label("total_beds")
-        )
-        .join(Hospital, Hospital.district_id == District.district_id)
-        .filter(District.state_id == state_id)
-        .group_by(District.district_name)
-        .order_by(District.district_name)
-        .all()
-    )
+    rows = district_stats_rows(state_id, with_hospitals=True)
 
     if not rows:
         return jsonify({"error": "No data for given state_id"}), 404
 
-    districts = [r.district_name for r in rows]
-    total_beds = [r.total_beds for r in rows]
-
-    y = range(len(districts))
-    size = get_figsize()
-    fig, ax = plt.subplots(figsize=size)
-
-    bg_color = get_bg_color()
-    color = get_color()
-    text_color = get_text_color()
-
-    if bg_color:
-        fig.patch.set_facecolor(bg_color)
-        ax.set_facecolor(bg_color)
-    
-    ax.barh(y, total_beds, color=color)
-
-    ax.set_yticks(y)
-    ax.set_yticklabels(districts)
-    ax.invert_yaxis()
-    ax.set_xlabel("Total beds", color=text_color)
-    ax.set_title(f"Total hospital beds by district", color=text_color)
-    plt.setp(ax.get_xticklabels(), color=text_color)
-    plt.setp(ax.get_yticklabels(), color=text_color)
-
-    fig.tight_layout()
-    return fig_to_png_response(fig)
+    return {
+        "kind": "barh",
+        "labels": [r.district_name for r in rows],
+        "values": [r.total_beds for r in rows],
+        "title": "Total hospital beds by district",
+        "xlabel": "Total beds",
+    }
 
 
 # GET /api/charts/state-district-population  
 # Population per district
-# Params: state_id (required), w,h,color,text_color,bg_color
+# Params: state_id (required), w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
 @api_charts.route("/state-district-population", methods=["GET"])
+@cached_chart
 def state_district_population():
     state_id = request.args.get("state_id", type=int)
     if not state_id:
         return jsonify({"error": "state_id is required"}), 400
 
-    rows = (
-        db.session.query(
-            District.district_name,
-            District.total_persons.label("population")
-        )
-        .filter(District.state_id == state_id)
-        .order_by(District.district_name)
-        .all()
-    )
+    rows = district_stats_rows(state_id)
 
     if not rows:
         return jsonify({"error": "No data for given state_id"}), 404
 
-    districts = [r.district_name for r in rows]
-    population = [r.population or 0 for r in rows]
-
-    y = range(len(districts))
-    size = get_figsize()
-    fig, ax = plt.subplots(figsize=size)
-
-    bg_color = get_bg_color()
-    color = get_color()
-    text_color = get_text_color()
-
-    if bg_color:
-        fig.patch.set_facecolor(bg_color)
-        ax.set_facecolor(bg_color)
-
-    ax.barh(y, population, color=color)
-
-    ax.set_yticks(y)
-    ax.set_yticklabels(districts)
-    ax.invert_yaxis()
-    ax.set_xlabel("Population", color=text_color)
-    ax.set_title(f"District population", color=text_color)
-    plt.setp(ax.get_xticklabels(), color=text_color)
-    plt.setp(ax.get_yticklabels(), color=text_color)
-
-    fig.tight_layout()
-    return fig_to_png_response(fig)
+    return {
+        "kind": "barh",
+        "labels": [r.district_name for r in rows],
+        "values": [r.total_persons or 0 for r in rows],
+        "title": "District population",
+        "xlabel": "Population",
+    }
 
 
 # GET /api/charts/state-district-hospitals-vs-population  
 # Scatter plot
-# Params: state_id (required), w,h,color,text_color,bg_color
+# Params: state_id (optional; all districts in India when omitted), w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
 @api_charts.route("/state-district-hospitals-vs-population", methods=["GET"])
+@cached_chart
 def state_district_hospitals_vs_population():
     state_id = request.args.get("state_id", type=int)
-    if not state_id:
-        return jsonify({"error": "state_id is required"}), 400
 
-    rows = (
-        db.session.query(
-            District.district_name,
-            District.total_persons.label("population"),
-            func.count(Hospital.hospital_id).label("num_hospitals")
-        )
-        .join(Hospital, Hospital.district_id == District.district_id)
-        .filter(District.state_id == state_id)
-        .group_by(District.district_name, District.total_persons)
-        .order_by(District.district_name)
-        .all()
-    )
+    rows = district_stats_rows(state_id, with_hospitals=True)
 
     if not rows:
         return jsonify({"error": "No data for given state_id"}), 404
 
-    districts = [r.district_name for r in rows]
-    population = [r.population or 0 for r in rows]
-    num_hospitals = [r.num_hospitals for r in rows]
-
-    size = get_figsize()
-    fig, ax = plt.subplots(figsize=size)
-
-    bg_color = get_bg_color()
-    color = get_color()
-    text_color = get_text_color()
-
-    if bg_color:
-        fig.patch.set_facecolor(bg_color)
-        ax.set_facecolor(bg_color)
-
-    ax.scatter(population, num_hospitals, color=color)
-
-    ax.set_xlabel("Population", color=text_color)
-    ax.set_ylabel("Number of hospitals", color=text_color)
-    ax.set_title(f"Hospitals vs population by district", color=text_color)
-    plt.setp(ax.get_xticklabels(), color=text_color)
-    plt.setp(ax.get_yticklabels(), color=text_color)
-
-    placed_labels = []
-    if population:
-        x_min, x_max = min(population), max(population)
-        y_min, y_max = min(num_hospitals), max(num_hospitals)
-        x_range = max(x_max - x_min, 1)
-        y_range = max(y_max - y_min, 1)
-        x_tol = 0.03 * x_range
-        y_tol = 0.03 * y_range
-
-        for name, x, y in zip(districts, population, num_hospitals):
-            too_close = False
-            for (px, py) in placed_labels:
-                if abs(x - px) < x_tol and abs(y - py) < y_tol:
-                    too_close = True
-                    break
-
-            if too_close:
-                continue
-
-            ax.annotate(
-                name,
-                (x, y),
-                textcoords="offset points",
-                xytext=(3, 3),
-                fontsize=7,
-            )
-            placed_labels.append((x, y))
-
-    fig.tight_layout()
-    return fig_to_png_response(fig)
+    return {
+        "kind": "scatter",
+        "labels": [r.district_name for r in rows],
+        "x": [r.total_persons or 0 for r in rows],
+        "y": [r.num_hospitals for r in rows],
+        "title": "Hospitals vs population by district",
+        "xlabel": "Population",
+        "ylabel": "Number of hospitals",
+    }
 
 
 # GET /api/charts/state-district-bed-ratio  
 # Beds per 10k population
-# Params: state_id (required), w,h,color,text_color,bg_color
+# Params: state_id (required), w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
 @api_charts.route("/state-district-bed-ratio", methods=["GET"])
+@cached_chart
 def state_district_bed_ratio():
     state_id = request.args.get("state_id", type=int)
     if not state_id:
         return jsonify({"error": "state_id is required"}), 400
 
+    rows = district_stats_rows(state_id, with_hospitals=True)
+
+    if not rows:
+        return jsonify({"error": "No data for given state_id"}), 404
+
+    return {
+        "kind": "barh",
+        "labels": [r.district_name for r in rows],
+        "values": [r.beds_per_10k for r in rows],
+        "title": "Hospital bed availability ratio by district",
+        "xlabel": "Beds per 10,000 people",
+    }
+
+
+# GET /api/charts/state-district-accessibility  
+# Mean distance from each district's centroid to its nearest hospitals
+# Params: state_id (required), scope ("all" default, "type:<hospital_type>", "category:<category_id>"),
+#         w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
+@api_charts.route("/state-district-accessibility", methods=["GET"])
+@cached_chart
+def state_district_accessibility():
+    state_id = request.args.get("state_id", type=int)
+    scope = (request.args.get("scope") or "all").strip()
+    if not state_id:
+        return jsonify({"error": "state_id is required"}), 400
+
     rows = (
-        db.session.query(
-            District.district_name,
-            District.total_persons.label("population"),
-            func.coalesce(func.sum(Hospital.total_beds), 0).label("total_beds")
-        )
-        .join(Hospital, Hospital.district_id == District.district_id)
-        .filter(District.state_id == state_id)
-        .group_by(District.district_name, District.total_persons)
-        .order_by(District.district_name)
+        DistrictAccessibility.query
+        .filter_by(state_id=state_id, scope=scope)
+        .filter(DistrictAccessibility.mean_nearest_km.isnot(None))
+        .order_by(DistrictAccessibility.district_name)
         .all()
     )
 
     if not rows:
-        return jsonify({"error": "No data for given state_id"}), 404
+        return jsonify({"error": "No data for given state_id and scope"}), 404
+
+    return {
+        "kind": "barh",
+        "labels": [r.district_name for r in rows],
+        "values": [r.mean_nearest_km for r in rows],
+        "title": f"Distance to nearest {rows[0].n_nearest} hospitals by district",
+        "xlabel": "Mean distance (km)",
+    }
+
+
+# Rows of the precomputed state_stats table for cross-state charts.
+# with_hospitals=True keeps only states that have at least one hospital,
+# with_population=True only states with population data.
+def state_stats_rows(with_hospitals=False, with_population=False):
+    query = StateStats.query
+    if with_hospitals:
+        query = query.filter(StateStats.num_hospitals > 0)
+    if with_population:
+        query = query.filter(StateStats.total_persons > 0)
+    return query.order_by(StateStats.state_name).all()
+
+
+# GET /api/charts/states-hospitals  
+# Hospitals per state
+# Params: w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
+@api_charts.route("/states-hospitals", methods=["GET"])
+@cached_chart
+def states_hospitals():
+    rows = state_stats_rows(with_hospitals=True)
+
+    if not rows:
+        return jsonify({"error": "No state data"}), 404
 
-    districts = []
-    ratios = []
+    return {
+        "kind": "barh",
+        "labels": [r.state_name for r in rows],
+        "values": [r.num_hospitals for r in rows],
+        "title": "Number of hospitals by state",
+        "xlabel": "Number of hospitals",
+    }
+
+
+# GET /api/charts/states-beds  
+# Total beds per state
+# Params: w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
+@api_charts.route("/states-beds", methods=["GET"])
+@cached_chart
+def states_beds():
+    rows = state_stats_rows(with_hospitals=True)
+
+    if not rows:
+        return jsonify({"error": "No state data"}), 404
+
+    return {
+        "kind": "barh",
+        "labels": [r.state_name for r in rows],
+        "values": [r.total_beds for r in rows],
+        "title": "Total hospital beds by state",
+        "xlabel": "Total beds",
+    }
+
+
+# GET /api/charts/states-population  
+# Population per state
+# Params: w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
+@api_charts.route("/states-population", methods=["GET"])
+@cached_chart
+def states_population():
+    rows = state_stats_rows(with_population=True)
+
+    if not rows:
+        return jsonify({"error": "No state data"}), 404
+
+    return {
+        "kind": "barh",
+        "labels": [r.state_name for r in rows],
+        "values": [r.total_persons for r in rows],
+        "title": "State population",
+        "xlabel": "Population",
+    }
+
+
+# GET /api/charts/states-bed-ratio  
+# Beds per 10k population by state
+# Params: w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
+@api_charts.route("/states-bed-ratio", methods=["GET"])
+@cached_chart
+def states_bed_ratio():
+    rows = state_stats_rows(with_hospitals=True, with_population=True)
+
+    if not rows:
+        return jsonify({"error": "No state data"}), 404
+
+    return {
+        "kind": "barh",
+        "labels": [r.state_name for r in rows],
+        "values": [r.beds_per_10k for r in rows],
+        "title": "Hospital bed availability ratio by state",
+        "xlabel": "Beds per 10,000 people",
+    }
+
+
+# GET /api/charts/states-hospital-ratio  
+# Hospitals per 100k population by state
+# Params: w,h,dpi,color,text_color,bg_color,format (png|webp|svg|json),variant (full|thumb)
+@api_charts.route("/states-hospital-ratio", methods=["GET"])
+@cached_chart
+def states_hospital_ratio():
+    rows = state_stats_rows(with_hospitals=True, with_population=True)
+
+    if not rows:
+        return jsonify({"error": "No state data"}), 404
+
+    return {
+        "kind": "barh",
+        "labels": [r.state_name for r in rows],
+        "values": [r.hospitals_per_100k for r in rows],
+        "title": "Hospitals per 100,000 people by state",
+        "xlabel": "Hospitals per 100,000 people",
+    }
 
-    for r in rows:
-        pop = r.population or 0
-        beds = r.total_beds or 0
-        if pop > 0:
-            ratio = beds * 10000.0 / pop
-        else:
-            ratio = 0
-        districts.append(r.district_name)
-        ratios.append(ratio)
-
-    y = range(len(districts))
-    size = get_figsize()
-    fig, ax = plt.subplots(figsize=size)
-
-    bg_color = get_bg_color()
-    color = get_color()
-    text_color = get_text_color()
-
-    if bg_color:
-        fig.patch.set_facecolor(bg_color)
-        ax.set_facecolor(bg_color)
-
-    ax.barh(y, ratios, color=color)
-
-    ax.set_yticks(y)
-    ax.set_yticklabels(districts)
-    ax.invert_yaxis()
-    ax.set_xlabel("Beds per 10,000 people", color=text_color)
-    ax.set_title(f"Hospital bed availability ratio by district", color=text_color)
-    plt.setp(ax.get_xticklabels(), color=text_color)
-    plt.setp(ax.get_yticklabels(), color=text_color)
-
-    fig.tight_layout()
-    return fig_to_png_response(fig)
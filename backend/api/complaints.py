@@ -6,9 +6,22 @@ import math
 
 from extensions import db
 from models import Complaint, State, District, Hospital, User
+from services.complaint_stats import GRANULARITIES, GROUP_BY, record_complaint, complaint_series, parse_day
+from services.hotspots import HOTSPOT_LEVELS, get_hotspot_index, record_hotspot
+from services.pagination import COUNT_MODES, decode_cursor, encode_cursor, keyset_page, listing_total
+from services.fieldsets import parse_fields, fields_query, row_dict
+from data_version import bump_data_version
+from conditional_get import versioned
 
 api_complaints = Blueprint("api_complaints", __name__, url_prefix="/api/complaints")
 
+# Orderings that support cursor pagination (each has a composite index with complaint_id).
+# created_at is NOT NULL (migration 9d1c7e3a5f42), so the key never contains NULL.
+COMPLAINT_CURSOR_ORDERS = ("created_at", "complaint_id")
+
+# Columns selectable with fields= on /api/complaints (never mobile or name)
+COMPLAINT_FIELDS = ("complaint_id", "state_id", "district_id", "hospital_id", "title", "details", "created_at")
+
 def serialize_complaint_search(c):
         return {
             "complaint_id": c.complaint_id,
@@ -133,8 +146,16 @@ def create_complaint():
     )
 
     db.session.add(complaint)
+    db.session.flush()
+
+    # Keep the daily rollup and the complaint data version in step; both
+    # commit together with the complaint
+    record_complaint(complaint)
+    bump_data_version("complaint")
     db.session.commit()
 
+    record_hotspot(complaint)
+
     return jsonify({
         "message": "Complaint created successfully",
         "data": complaint.to_dict()
@@ -144,16 +165,22 @@ def create_complaint():
 # GET /api/complaints
 # Description: Retrieves a paginated list of complaints with optional filters for state, district, and hospital.
 # Supports full-text search across title and details, configurable sorting, and adjustable page size.
+# When ordered by created_at or complaint_id, every page returns a next_cursor; passing it back as
+# cursor fetches the next page by key (backed by composite indexes), so deep pages cost the same as
+# the first. Page numbers still work but are offset based.
 # 
 # Query params:
 #       state_id: int
 #       district_id: int
 #       hospital_id: int
 #       search: str   # matches title OR details (ILIKE %search%)
+#       cursor: str   # next_cursor from the previous page (replaces page)
 #       page: int (default 1)
 #       page_size: int (default 20, max 100)
-#       order_by: str (default 'created_at' if present else 'complaint_id')
+#       order_by: str (default 'created_at')
 #       order_dir: 'asc'|'desc' (default 'desc')
+#       count: 'exact'|'estimate'|'none' (default 'exact' with page, 'none' with cursor)
+#       fields: str   # comma separated subset of complaint_id,state_id,district_id,hospital_id,title,details,created_at
 @api_complaints.route("/", methods=["GET"])
 def get_complaints():
     state_id = request.args.get("state_id", type=int)
@@ -161,21 +188,35 @@ def get_complaints():
     hospital_id = request.args.get("hospital_id", type=int)
     search = request.args.get("search", type=str)
 
+    cursor = request.args.get("cursor", type=str)
     page = request.args.get("page", default=1, type=int)
+    page = 1 if cursor else max(1, page or 1)
     page_size = request.args.get("page_size", default=20, type=int)
     page_size = max(1, min(page_size or 20, 100))
 
     order_by = request.args.get("order_by", default=None, type=str)
     order_dir = request.args.get("order_dir", default="desc", type=str)
 
-    query = (
-        Complaint.query
-        .options(
-            joinedload(Complaint.state),
-            joinedload(Complaint.district),
-            joinedload(Complaint.hospital) if hasattr(Complaint, "hospital") else joinedload(Complaint.district)
-        )
-    )
+    count_mode = (request.args.get("count") or ("none" if cursor else "exact")).strip().lower()
+    if count_mode not in COUNT_MODES:
+        return jsonify({"error": f"count must be one of: {', '.join(COUNT_MODES)}"}), 400
+
+    try:
+        fields = parse_fields(request.args.get("fields"), COMPLAINT_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Ordering; complaint_id breaks ties so pages never overlap
+    order_col = getattr(Complaint, order_by) if (order_by and hasattr(Complaint, order_by)) else Complaint.created_at
+    descending = order_dir.lower() != "asc"
+    columns = [order_col] if order_col is Complaint.complaint_id else [order_col, Complaint.complaint_id]
+    order_key = f"{order_col.key}:{'desc' if descending else 'asc'}"
+    keyset = order_col.key in COMPLAINT_CURSOR_ORDERS
+
+    if fields is None:
+        query = Complaint.query
+    else:
+        query = fields_query(Complaint, fields, extra=[c.key for c in columns])
 
     # Exact filters
     if state_id is not None:
@@ -193,28 +234,133 @@ def get_complaints():
             Complaint.details.ilike(like),
         ))
 
-    # Ordering
-    default_order_col = getattr(Complaint, "created_at", None) or Complaint.complaint_id
-    order_col = getattr(Complaint, order_by) if (order_by and hasattr(Complaint, order_by)) else default_order_col
-    query = query.order_by(order_col.asc() if order_dir.lower() == "asc" else order_col.desc())
+    total = listing_total(query, count_mode)
+
+    after = None
+    if cursor:
+        if not keyset:
+            return jsonify({"error": f"cursor requires order_by one of: {', '.join(COMPLAINT_CURSOR_ORDERS)}"}), 400
+        try:
+            after = decode_cursor(cursor, order_key, columns)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    if fields is None:
+        query = query.options(
+            joinedload(Complaint.state),
+            joinedload(Complaint.district),
+            joinedload(Complaint.hospital) if hasattr(Complaint, "hospital") else joinedload(Complaint.district)
+        )
 
     # Pagination
-    total = query.count()
-    items = query.offset((page - 1) * page_size).limit(page_size).all()
+    items, has_next = keyset_page(query, columns, descending, after, page_size, offset=(page - 1) * page_size)
+
+    next_cursor = None
+    if keyset and has_next:
+        last = items[-1]
+        next_cursor = encode_cursor(order_key, [getattr(last, c.key) for c in columns])
 
     return jsonify({
-        "data": [serialize_complaint_search(c) for c in items],
+        "data": [serialize_complaint_search(c) if fields is None else row_dict(c, fields) for c in items],
         "pagination": {
-            "page": page,
+            "page": None if cursor else page,
             "page_size": page_size,
             "total": total,
-            "total_pages": math.ceil(total / page_size),
-            "has_next": page * page_size < total,
-            "has_prev": page > 1,
+            "total_pages": math.ceil(total / page_size) if total is not None else None,
+            "count": count_mode,
+            "has_next": has_next,
+            "has_prev": bool(cursor) or page > 1,
+            "next_cursor": next_cursor,
         }
     })
 
 
+# GET /api/complaints/stats
+# Description: Complaint counts over time from the pre-aggregated daily rollup
+# (complaint_daily_stats), so trend views never scan the complaint table.
+#
+# Query params:
+#       granularity: 'day'|'week'|'month' (default 'day')
+#       from: YYYY-MM-DD (inclusive)
+#       to: YYYY-MM-DD (inclusive)
+#       state_id: int
+#       district_id: int
+#       hospital_id: int
+#       group_by: 'state'|'district'|'hospital' (optional, one series per group)
+@api_complaints.route("/stats", methods=["GET"])
+@versioned("complaint")
+def get_complaint_stats():
+    state_id = request.args.get("state_id", type=int)
+    district_id = request.args.get("district_id", type=int)
+    hospital_id = request.args.get("hospital_id", type=int)
+
+    granularity = (request.args.get("granularity") or "day").strip().lower()
+    group_by = (request.args.get("group_by") or "").strip().lower() or None
+
+    if granularity not in GRANULARITIES:
+        return jsonify({"error": f"granularity must be one of: {', '.join(GRANULARITIES)}"}), 400
+    if group_by is not None and group_by not in GROUP_BY:
+        return jsonify({"error": f"group_by must be one of: {', '.join(GROUP_BY)}"}), 400
+
+    try:
+        start = parse_day(request.args.get("from"))
+        end = parse_day(request.args.get("to"))
+    except ValueError:
+        return jsonify({"error": "from and to must be dates in YYYY-MM-DD format"}), 400
+
+    rows = complaint_series(
+        granularity, start, end,
+        state_id=state_id, district_id=district_id, hospital_id=hospital_id,
+        group_by=group_by,
+    )
+
+    if group_by is None:
+        series = [{"period": period.isoformat(), "count": count} for period, _, count in rows]
+    else:
+        series = [
+            {"period": period.isoformat(), f"{group_by}_id": group_id, "count": count}
+            for period, group_id, count in rows
+        ]
+
+    return jsonify({
+        "granularity": granularity,
+        "group_by": group_by,
+        "from": start.isoformat() if start else None,
+        "to": end.isoformat() if end else None,
+        "total": sum(count for _, _, count in rows),
+        "data": series,
+    }), 200
+
+
+# GET /api/complaints/hotspots
+# Description: Worst hospitals or districts by time-decayed complaint rate, normalized by
+# capacity (complaints per 100 beds / per 100k population). Served from an in-memory
+# index that is updated as complaints arrive.
+#
+# Query params:
+#       level: 'hospital'|'district' (default 'hospital')
+#       state_id: int (optional, otherwise across all states)
+#       k: int (default 10, max 100)
+@api_complaints.route("/hotspots", methods=["GET"])
+def get_complaint_hotspots():
+    level = (request.args.get("level") or "hospital").strip().lower()
+    state_id = request.args.get("state_id", type=int)
+    k = request.args.get("k", default=10, type=int)
+    k = max(1, min(k or 10, 100))
+
+    if level not in HOTSPOT_LEVELS:
+        return jsonify({"error": f"level must be one of: {', '.join(HOTSPOT_LEVELS)}"}), 400
+
+    data = get_hotspot_index().top(level, state_id, k)
+
+    return jsonify({
+        "level": level,
+        "state_id": state_id,
+        "count": len(data),
+        "data": data,
+    }), 200
+
+
 # Get Complaint by ID
 # GET /api/complaints/<complaint_id>
 # Returns complaint details (without phone number) including state, district, and hospital info.
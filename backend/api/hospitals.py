@@ -1,29 +1,21 @@
-from flask import Blueprint, jsonify, request
-from extensions import db
-from models import State, District, Hospital
-from sqlalchemy.orm import joinedload
+from hashlib import sha256
 
-api_hospitals = Blueprint("hospitals", __name__, url_prefix="/api/hospitals")
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from extensions import db
+from models import State, Hospital
+from sqlalchemy import select
 
+from services.reference_data import get_reference_data
+from services.hospital_snapshots import build_grouped_states, get_snapshot_store, stream_snapshots
+from services.pagination import COUNT_MODES, decode_cursor, encode_cursor, keyset_page, listing_total
+from services.fieldsets import parse_fields, fields_query, row_dict
+from services.row_fragments import HOSPITAL_TABLES, get_hospital_fragments
+from conditional_get import versioned
 
-def serialize_hospital(h):
-    return {
-        **h.to_dict(),
-        "state": h.state.to_dict() if h.state else None,
-        "district": h.district.to_dict() if h.district else None,
-        "categories": [c.to_dict() for c in (h.categories or [])],
-    }
+api_hospitals = Blueprint("hospitals", __name__, url_prefix="/api/hospitals")
 
 
-def fetch_hospitals(state_id=None, district_id=None, hospital_id=None):
-    query = (
-        Hospital.query
-        .options(
-            joinedload(Hospital.state),
-            joinedload(Hospital.district),
-            joinedload(Hospital.categories),
-        )
-    )
+def filter_hospitals(query, state_id=None, district_id=None, hospital_id=None):
     if state_id is not None:
         query = query.filter_by(state_id=state_id)
 
@@ -33,7 +25,64 @@ def fetch_hospitals(state_id=None, district_id=None, hospital_id=None):
     if hospital_id is not None:
         query = query.filter_by(hospital_id=hospital_id)
 
-    return query.order_by(Hospital.hospital_name.asc()).all()
+    return query
+
+
+# Listings select only (state_id, hospital_id) and take the encoded documents
+# from the fragment cache
+def key_query():
+    return db.session.query(Hospital.state_id, Hospital.hospital_id)
+
+
+# Keys of a key_query() in listing order
+def hospital_keys(query):
+    return [tuple(r) for r in query.order_by(Hospital.hospital_name.asc()).all()]
+
+
+# Columns selectable with fields= (the keys of Hospital.to_dict())
+HOSPITAL_FIELDS = (
+    "hospital_id", "state_id", "district_id", "hospital_name", "address", "pincode",
+    "latitude", "longitude", "mco_contact_number", "total_beds", "hospital_type", "government_subtype",
+)
+
+# Listing order for cursor pages of /api/hospitals: name, then the primary key
+HOSPITAL_CURSOR_ORDER = "hospital_name:asc"
+HOSPITAL_CURSOR_COLUMNS = (Hospital.hospital_name, Hospital.state_id, Hospital.hospital_id)
+
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+NDJSON_BATCH_SIZE = 500
+
+
+# True when the client asked for NDJSON (format=ndjson or Accept: application/x-ndjson)
+def wants_ndjson():
+    if (request.args.get("format") or "").strip().lower() == "ndjson":
+        return True
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+# Same filters and order as the list, but read through a server-side cursor
+# in batches of batch_size rows of the given columns. Nothing runs until the
+# first batch is requested, so a streamed response starts before any query.
+def iter_hospital_batches(columns, state_id=None, district_id=None, hospital_id=None, batch_size=NDJSON_BATCH_SIZE):
+    stmt = filter_hospitals(select(*columns), state_id, district_id, hospital_id)
+    stmt = stmt.order_by(Hospital.hospital_name.asc()).execution_options(yield_per=batch_size)
+    yield from db.session.execute(stmt).partitions()
+
+
+# One full hospital document per line: the same pre-encoded documents as the
+# JSON list (services.row_fragments), looked up a batch of keys at a time
+def stream_hospitals_ndjson(batches):
+    fragments = get_hospital_fragments()
+    for rows in batches:
+        keys = [(r.state_id, r.hospital_id) for r in rows]
+        yield "".join(f.text + "\n" for f in fragments.get(keys))
+
+
+# One row per line with only the requested fields
+def stream_hospital_rows_ndjson(batches, fields):
+    for rows in batches:
+        yield "".join(current_app.json.dumps(row_dict(r, fields), separators=(",", ":")) + "\n" for r in rows)
 
 
 # GET /api/hospitals/compact
@@ -42,14 +91,22 @@ def fetch_hospitals(state_id=None, district_id=None, hospital_id=None):
 #   - state_id    (int, required): State to filter by.
 #   - district_id (int, optional): District to filter by (within the state).
 #   - hospital_id (int, optional): Specific hospital ID.
+#   - fields      (str, optional): Comma separated hospital columns to return, e.g. hospital_id,hospital_name,latitude,longitude.
 @api_hospitals.route("/compact", methods=["GET"])
+@versioned(*HOSPITAL_TABLES)
 def get_hospitals_compact():
     state_id = request.args.get("state_id", type=int)
     district_id = request.args.get("district_id", type=int)
     hospital_id = request.args.get("hospital_id", type=int)
 
+    try:
+        fields = parse_fields(request.args.get("fields"), HOSPITAL_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    base = key_query() if fields is None else fields_query(Hospital, fields)
     query = (
-        Hospital.query
+        base
         .filter_by(state_id=state_id)
     )
 
@@ -59,38 +116,189 @@ def get_hospitals_compact():
     if hospital_id is not None:
         query = query.filter_by(hospital_id=hospital_id)
 
-    hospitals = query.order_by(Hospital.hospital_name.asc()).all()
+    if fields is None:
+        data = get_hospital_fragments().get(hospital_keys(query), compact=True)
+    else:
+        data = [row_dict(h, fields) for h in query.order_by(Hospital.hospital_name.asc()).all()]
 
     return jsonify({
-        "count": len(hospitals),
-        "data": [h.to_dict() for h in hospitals]
+        "count": len(data),
+        "data": data
     }), 200
 
 
 # GET /api/hospitals
 # Return hospitals filtered by state_id and optionally district_id and/or hospital_id.
+# With format=ndjson (or Accept: application/x-ndjson) hospitals are streamed one per line,
+# read in batches, so memory stays flat for whole-country exports.
+# With page_size (or cursor) the list is paginated by key on (hospital_name, state_id, hospital_id);
+# pass pagination.next_cursor back as cursor for the next page.
 # Query:
-#   - state_id    (int, optional): State filter; if omitted, behavior depends on fetch_hospitals.
+#   - state_id    (int, optional): State filter; if omitted, all states.
 #   - district_id (int, optional): District filter.
 #   - hospital_id (int, optional): Specific hospital ID.
+#   - format      (str, optional): "ndjson" to stream newline-delimited JSON.
+#   - page_size   (int, optional): Page size (max 500); enables pagination.
+#   - cursor      (str, optional): next_cursor of the previous page.
+#   - count       (str, optional): Total to report with pages: "exact", "estimate" or "none" (default).
+#   - fields      (str, optional): Comma separated hospital columns to return instead of the full nested
+#                                  document, e.g. hospital_id,hospital_name,latitude,longitude.
 @api_hospitals.route("/", methods=["GET"])
+@versioned(*HOSPITAL_TABLES)
 def get_hospitals():
     state_id = request.args.get("state_id", type=int) # defailt None
     district_id = request.args.get("district_id", type=int)
     hospital_id = request.args.get("hospital_id", type=int)
-
-    hospitals = fetch_hospitals(state_id, district_id, hospital_id)
-
-    if not hospitals:
+    page_size = request.args.get("page_size", type=int)
+    cursor = request.args.get("cursor", type=str)
+
+    try:
+        fields = parse_fields(request.args.get("fields"), HOSPITAL_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if wants_ndjson():
+        # An EXISTS probe keeps the 404; the export itself runs as the body streams
+        exists = filter_hospitals(key_query(), state_id, district_id, hospital_id).exists()
+        if not db.session.query(exists).scalar():
+            return jsonify({"message": f"No hospitals found for state_id {state_id}, district_id {district_id}, hospital_id {hospital_id}"}), 404
+
+        if fields is None:
+            batches = iter_hospital_batches((Hospital.state_id, Hospital.hospital_id), state_id, district_id, hospital_id)
+            stream = stream_hospitals_ndjson(batches)
+        else:
+            batches = iter_hospital_batches([getattr(Hospital, f) for f in fields], state_id, district_id, hospital_id)
+            stream = stream_hospital_rows_ndjson(batches, fields)
+        return Response(stream_with_context(stream), status=200, mimetype=NDJSON_MIMETYPE)
+
+    if page_size is not None or cursor:
+        return get_hospitals_page(state_id, district_id, hospital_id, page_size, cursor, fields)
+
+    if fields is None:
+        keys = hospital_keys(filter_hospitals(key_query(), state_id, district_id, hospital_id))
+        data = get_hospital_fragments().get(keys)
+    else:
+        query = filter_hospitals(fields_query(Hospital, fields), state_id, district_id, hospital_id)
+        data = [row_dict(h, fields) for h in query.order_by(Hospital.hospital_name.asc()).all()]
+
+    if not data:
         return jsonify({"message": f"No hospitals found for state_id {state_id}, district_id {district_id}, hospital_id {hospital_id}"}), 404
 
-    data = [serialize_hospital(h) for h in hospitals]
     return jsonify({"count": len(data), "data": data}), 200
 
 
+# Cursor page of /api/hospitals; see get_hospitals for the parameters
+def get_hospitals_page(state_id, district_id, hospital_id, page_size, cursor, fields=None):
+    page_size = max(1, min(page_size or 50, 500))
+    count_mode = (request.args.get("count") or "none").strip().lower()
+    if count_mode not in COUNT_MODES:
+        return jsonify({"error": f"count must be one of: {', '.join(COUNT_MODES)}"}), 400
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, HOSPITAL_CURSOR_ORDER, HOSPITAL_CURSOR_COLUMNS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    key = [c.key for c in HOSPITAL_CURSOR_COLUMNS]
+    query = filter_hospitals(fields_query(Hospital, fields or [], extra=key), state_id, district_id, hospital_id)
+    total = listing_total(query, count_mode)
+
+    hospitals, has_next = keyset_page(query, HOSPITAL_CURSOR_COLUMNS, after=after, page_size=page_size)
+
+    next_cursor = None
+    if has_next:
+        last = hospitals[-1]
+        next_cursor = encode_cursor(HOSPITAL_CURSOR_ORDER, [getattr(last, c.key) for c in HOSPITAL_CURSOR_COLUMNS])
+
+    if fields is None:
+        data = get_hospital_fragments().get([(h.state_id, h.hospital_id) for h in hospitals])
+    else:
+        data = [row_dict(h, fields) for h in hospitals]
+    return jsonify({
+        "count": len(data),
+        "data": data,
+        "pagination": {
+            "page_size": page_size,
+            "total": total,
+            "count": count_mode,
+            "has_next": has_next,
+            "has_prev": bool(cursor),
+            "next_cursor": next_cursor,
+        },
+    }), 200
+
+
+# GET /api/hospitals/nearby
+# Return the hospitals closest to a point, nearest first, from an in-memory spatial index.
+# Query:
+#   - lat, lon    (float, required): Point to search around (degrees).
+#   - k           (int, optional): Maximum number of hospitals (default 10, max 100).
+#   - radius_km   (float, optional): Only hospitals within this great-circle distance.
+@api_hospitals.route("/nearby", methods=["GET"])
+@versioned(*HOSPITAL_TABLES)
+def get_nearby_hospitals():
+    lat = request.args.get("lat", type=float)
+    lon = request.args.get("lon", type=float)
+    k = request.args.get("k", default=10, type=int)
+    radius_km = request.args.get("radius_km", type=float)
+
+    if lat is None or lon is None:
+        return jsonify({"error": "lat and lon are required"}), 400
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return jsonify({"error": "lat must be within [-90, 90] and lon within [-180, 180]"}), 400
+    if radius_km is not None and radius_km <= 0:
+        return jsonify({"error": "radius_km must be positive"}), 400
+    k = max(1, min(k or 10, 100))
+
+    # Loaded on first use; keeps numpy/scipy out of workers that never do spatial queries
+    from services.hospital_index import get_hospital_index
+
+    results = get_hospital_index().nearby(lat, lon, k=k, radius_km=radius_km)
+
+    return jsonify({
+        "count": len(results),
+        "data": [{**row, "distance_km": round(distance, 3)} for row, distance in results],
+    }), 200
+
+
+# GET /api/hospitals/search
+# Typo-tolerant hospital autocomplete: top matches of q against hospital names (and addresses),
+# ranked by trigram overlap, from an in-memory trigram index.
+# Query:
+#   - q           (str, required): Search text (at least 2 characters).
+#   - state_id    (int, optional): Only hospitals of this state.
+#   - district_id (int, optional): Only hospitals of this district.
+#   - k           (int, optional): Maximum number of matches (default 10, max 50).
+@api_hospitals.route("/search", methods=["GET"])
+@versioned(*HOSPITAL_TABLES)
+def search_hospitals():
+    q = (request.args.get("q") or "").strip()
+    state_id = request.args.get("state_id", type=int)
+    district_id = request.args.get("district_id", type=int)
+    k = request.args.get("k", default=10, type=int)
+    k = max(1, min(k or 10, 50))
+
+    if len(q) < 2:
+        return jsonify({"error": "q must be at least 2 characters"}), 400
+
+    # Loaded on first use; keeps numpy out of workers that never search
+    from services.hospital_search import get_hospital_search_index
+
+    results = get_hospital_search_index().search(q, k=k, state_id=state_id, district_id=district_id)
+
+    return jsonify({
+        "count": len(results),
+        "data": [{**row, "score": round(score, 4)} for row, score in results],
+    }), 200
+
+
 # GET /api/hospitals/grouped
 # Return hospitals grouped hierarchically: state → districts → hospitals.
 # Ensures states and districts appear even when no hospitals exist in that district.
+# Whole states are streamed from precomputed per-state deflate snapshots (services.hospital_snapshots),
+# sent compressed when the client accepts gzip; the district filter is built per request.
 # Query:
 #   - state_id    (int, optional): If omitted, include all states.
 #   - district_id (int, optional): Restrict to this district (optional).
@@ -99,75 +307,35 @@ def get_grouped_hospitals():
     state_id = request.args.get("state_id", type=int)
     district_id = request.args.get("district_id", type=int)
 
-    # Fetch all states (apply filter if state_id provided)
-    state_query = State.query
+    states = get_reference_data().states
     if state_id:
-        state_query = state_query.filter(State.state_id == state_id)
-
-    states = state_query.order_by(State.state_name).all()
+        states = [s for s in states if s["state_id"] == state_id]
 
     if not states:
         return jsonify({"message": "No states found", "count": 0, "data": []}), 404
 
-    # Fetch all districts for the selected states (apply filters if given)
-    district_query = District.query
-    if state_id:
-        district_query = district_query.filter(District.state_id == state_id)
-    if district_id:
-        district_query = district_query.filter(District.district_id == district_id)
-
-    districts = district_query.order_by(District.district_name).all()
-
-    # Fetch hospitals joined with state and district (filtered if specified)
-    hospital_query = (
-        Hospital.query
-        .options(
-            joinedload(Hospital.state).undefer('*'),
-            joinedload(Hospital.district).undefer('*')
-        )
-        .order_by(Hospital.hospital_name)
-    )
-
-    if state_id:
-        hospital_query = hospital_query.filter(Hospital.state_id == state_id)
+    # A single district is small; build it directly instead of from the snapshot
     if district_id:
-        hospital_query = hospital_query.filter(Hospital.district_id == district_id)
-
-    hospitals = hospital_query.all()
-
-    # Initialize state map
-    state_map = {
-        s.state_id: {
-            **s.to_dict(),
-            "districts": {}
-        }
-        for s in states
-    }
-
-    # Initialize district entries for each state even if no hospitals exist
-    for d in districts:
-        if d.state_id in state_map:
-            state_map[d.state_id]["districts"][d.district_id] = {
-                **d.to_dict(),
-                "hospitals": [],
-                "count": 0
-            }
-
-    # Assign hospitals to correct district
-    for h in hospitals:
-        s_id = h.state_id
-        d_id = h.district_id
-
-        if s_id in state_map and d_id in state_map[s_id]["districts"]:
-            entry = state_map[s_id]["districts"][d_id]
-            entry["hospitals"].append(h.to_dict())
-            entry["count"] += 1
-
-    # Convert dicts to lists and add district counts
-    result = []
-    for s in state_map.values():
-        s["districts"] = list(s["districts"].values())
-        s["count"] = len(s["districts"])
-        result.append(s)
-
-    return jsonify({"count": len(result), "data": result}), 200
+        state_rows = State.query.filter(State.state_id.in_([s["state_id"] for s in states]))
+        result = build_grouped_states(state_rows.order_by(State.state_name).all(), district_id)
+        response = jsonify({"count": len(result), "data": result})
+        response.add_etag()
+        return response.make_conditional(request)
+
+    store = get_snapshot_store()
+    entries = [store.get(s["state_id"]) for s in states]
+
+    # The gzip and identity bodies differ byte for byte, so each gets its own tag
+    compressed = "gzip" in request.accept_encodings
+    etag = sha256("|".join(e["digest"] for e in entries).encode()).hexdigest()
+    if compressed:
+        etag += "-gzip"
+    if etag in request.if_none_match:
+        return Response(status=304, headers={"ETag": f'"{etag}"', "Vary": "Accept-Encoding"})
+
+    response = Response(stream_snapshots(entries, compressed), status=200, mimetype="application/json")
+    response.set_etag(etag)
+    response.vary.add("Accept-Encoding")
+    if compressed:
+        response.content_encoding = "gzip"
+    return response
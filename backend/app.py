@@ -6,13 +6,17 @@ import os
 
 from config import Config
 from extensions import db
+from json_provider import FastJSONProvider
+from conditional_get import check_not_modified, add_validators
 from api.base import api_base
 from api.hospitals import api_hospitals
 from api.complaints import api_complaints
 from api.users import api_users
 from api.charts import api_charts
+from api.analytics import api_analytics
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
 cors_host = os.environ.get("EQUIHEALTH_FRONTEND", 'http://localhost:5173')
 CORS(app, resources={r"*": {"origins": [cors_host, 'http://localhost:5173']}})
@@ -29,6 +33,11 @@ app.register_blueprint(api_hospitals)
 app.register_blueprint(api_complaints)
 app.register_blueprint(api_users)
 app.register_blueprint(api_charts)
+app.register_blueprint(api_analytics)
+
+# ETag / Last-Modified and 304s for views marked with conditional_get.versioned
+app.before_request(check_not_modified)
+app.after_request(add_validators)
 
 port = os.environ.get("PORT", 5000)
 
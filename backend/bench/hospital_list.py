@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Hospital listing benchmark: times GET /api/hospitals/ through the test client
+# as served now (pre-encoded documents from services.row_fragments) against
+# the previous handler (load hospitals with their relations, build dicts and
+# encode them with the default provider), with orjson and without it.
+#
+#   python bench/hospital_list.py --state-id 18
+#   python bench/hospital_list.py --json out.json --runs 20
+#
+# Needs EQUIHEALTH_DATABASE_URL (or DB_*) set like the app and a seeded
+# database.
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+import json_provider  # noqa: E402
+from app import app  # noqa: E402
+from api.hospitals import filter_hospitals  # noqa: E402
+from models import Hospital  # noqa: E402
+
+
+# /api/hospitals/ before the fragment cache: the nested documents are built
+# from ORM objects on every request and encoded by Flask's default provider
+def previous_listing(state_id):
+    query = filter_hospitals(Hospital.query, state_id).options(
+        joinedload(Hospital.state),
+        joinedload(Hospital.district),
+        joinedload(Hospital.categories),
+    )
+    data = [
+        {
+            **h.to_dict(),
+            "state": h.state.to_dict() if h.state else None,
+            "district": h.district.to_dict() if h.district else None,
+            "categories": [c.to_dict() for c in (h.categories or [])],
+        }
+        for h in query.order_by(Hospital.hospital_name.asc()).all()
+    ]
+    return DefaultJSONProvider(app).response({"count": len(data), "data": data}).get_data()
+
+
+def clear_caches():
+    app.extensions.pop("hospital_fragments", None)
+    app.extensions.pop("reference_data", None)
+
+
+def time_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return {"median_ms": round(statistics.median(samples), 1), "min_ms": round(min(samples), 1)}
+
+
+# Timings of the current handler with the given orjson module (None for the
+# stdlib encoder): the first request after a data load, then warm requests
+def current_listing(client, url, encoder, runs):
+    json_provider.orjson = encoder
+    cold = []
+    for _ in range(max(1, runs // 4)):
+        clear_caches()
+        t = time.perf_counter()
+        client.get(url)
+        cold.append((time.perf_counter() - t) * 1000)
+    warm = time_ms(lambda: client.get(url), runs)
+    return {"cold_ms": round(statistics.median(cold), 1), **warm}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /api/hospitals/ listing.")
+    parser.add_argument("--state-id", type=int, default=None, help="State to list (default: all hospitals)")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    url = "/api/hospitals/" if args.state_id is None else f"/api/hospitals/?state_id={args.state_id}"
+    installed = json_provider.orjson
+    client = app.test_client()
+
+    with app.app_context():
+        expected = json.loads(previous_listing(args.state_id))
+        results = {"previous": time_ms(lambda: previous_listing(args.state_id), args.runs)}
+
+        encoders = {"stdlib": None}
+        if installed is not None:
+            has_fragment = hasattr(installed, "Fragment")
+            encoders[f"orjson {installed.__version__}{'' if has_fragment else ' (no Fragment)'}"] = installed
+
+        for name, encoder in encoders.items():
+            results[f"fragments, {name}"] = current_listing(client, url, encoder, args.runs)
+            if client.get(url).get_json() != expected:
+                print(f"FAIL: {url} with {name} differs from the previous handler")
+                sys.exit(1)
+        json_provider.orjson = installed
+
+    print(f"{url}: {expected['count']} hospitals")
+    for name, r in results.items():
+        cold = f"   cold {r['cold_ms']:>8} ms" if "cold_ms" in r else ""
+        print(f"{name:<36} median {r['median_ms']:>8} ms   min {r['min_ms']:>8} ms{cold}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Startup-time benchmark: measures the cold import cost of the backend entry
+# points in fresh interpreters and checks that heavy chart dependencies stay
+# out of processes that don't draw charts.
+#
+#   python bench/startup_time.py              # table
+#   python bench/startup_time.py --json out.json --runs 10
+#
+# Needs EQUIHEALTH_DATABASE_URL (or DB_*) set like the app; no database
+# connection is made.
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules that must not be imported by a plain `import app`
+HEAVY_MODULES = ["matplotlib", "numpy", "services.chart_drawing"]
+
+TARGETS = {
+    # API worker / `flask db upgrade` / seed scripts all start with this
+    "app": "import app",
+    # First chart request in an API worker
+    "app+charts": "import app; from services.chart_renderer import render_spec; import services.chart_drawing",
+}
+
+PROBE = """
+import sys, time, json
+t = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_once(stmt):
+    code = PROBE.format(stmt=stmt, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# Modules imported directly by the statement or one level below, by cumulative
+# import time (from python -X importtime)
+def top_imports(stmt, limit=10):
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two extra spaces per level
+        if len(name) - len(name.lstrip(" ")) > 3:
+            continue
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend import/startup time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, stmt in TARGETS.items():
+        runs = [run_once(stmt) for _ in range(args.runs)]
+        seconds = [r["seconds"] for r in runs]
+        results[name] = {
+            "median_ms": round(statistics.median(seconds) * 1000, 1),
+            "min_ms": round(min(seconds) * 1000, 1),
+            "heavy_modules_loaded": runs[-1]["loaded"],
+            "top_imports_ms": [
+                [module, round(us / 1000, 1)] for us, module in top_imports(stmt)
+            ],
+        }
+
+    for name, r in results.items():
+        print(f"{name:<12} median {r['median_ms']:>8} ms   min {r['min_ms']:>8} ms   heavy: {', '.join(r['heavy_modules_loaded']) or '-'}")
+        for module, ms in r["top_imports_ms"]:
+            print(f"    {ms:>8} ms  {module}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    # A plain `import app` must stay free of the chart stack
+    if results["app"]["heavy_modules_loaded"]:
+        print(f"FAIL: `import app` loaded {results['app']['heavy_modules_loaded']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
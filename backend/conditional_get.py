@@ -0,0 +1,73 @@
+from hashlib import sha1
+
+from flask import current_app, g, request
+from werkzeug.http import is_resource_modified
+
+from data_version import SCHEMA_TABLE, get_data_version, get_last_modified
+
+
+# Mark a view whose response is a pure function of its URL and the contents of
+# tables. GET requests to it get a validator derived from the data versions and
+# are answered with 304 before the view runs when the client's copy is current.
+# Views that derive their own ETag from their content (charts, grouped
+# snapshots) are not marked, so each resource has a single validator.
+def versioned(*tables):
+    def decorate(view):
+        view.data_tables = tables
+        return view
+    return decorate
+
+
+# Tables of the view handling this request, or None if it isn't versioned
+def _request_tables():
+    if request.method not in ("GET", "HEAD") or request.endpoint is None:
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, "data_tables", None)
+
+
+# before_request: compute the validators of a versioned request and answer 304
+# if they match. Reads only the data_version snapshot, which is refreshed at
+# most every DATA_VERSION_TTL seconds.
+def check_not_modified():
+    tables = _request_tables()
+    if tables is None:
+        return None
+
+    tables = (SCHEMA_TABLE, *tables)
+    key = "|".join([
+        current_app.config.get("CONDITIONAL_GET_SALT", ""),
+        get_data_version(*tables),
+        request.full_path,
+        request.headers.get("Accept", ""),
+    ])
+    etag = sha1(key.encode("utf-8")).hexdigest()
+    last_modified = get_last_modified(*tables)
+    g.validators = (etag, last_modified)
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+        _set_validators(response, etag, last_modified)
+        return response
+    return None
+
+
+# after_request: attach the validators to successful versioned responses
+def add_validators(response):
+    validators = g.pop("validators", None)
+    if validators is None or response.status_code != 200:
+        return response
+
+    _set_validators(response, *validators)
+    return response
+
+
+def _set_validators(response, etag, last_modified):
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # The ETag depends on Accept (e.g. NDJSON vs JSON listings)
+    response.vary.add("Accept")
+    # Cacheable, but revalidated on every use so a reload shows up at once
+    if "Cache-Control" not in response.headers:
+        response.headers["Cache-Control"] = "no-cache"
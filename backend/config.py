@@ -10,4 +10,52 @@ class Config:
         "EQUIHEALTH_DATABASE_URL",
         f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
     )
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Seconds a worker may reuse its snapshot of the data_version table
+    DATA_VERSION_TTL = float(os.getenv("DATA_VERSION_TTL", 2))
+
+    # Mixed into the ETags of versioned views; change it when a deploy alters
+    # response bodies without a migration or data reload
+    CONDITIONAL_GET_SALT = os.getenv("CONDITIONAL_GET_SALT", "")
+
+    # Rendered chart cache (per worker process)
+    CHART_CACHE_MAX_ENTRIES = int(os.getenv("CHART_CACHE_MAX_ENTRIES", 256))
+    CHART_CACHE_MAX_BYTES = int(os.getenv("CHART_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+    # Chart rendering process pool (0 workers renders on the request thread)
+    CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+    CHART_RENDER_MAX_QUEUE = int(os.getenv("CHART_RENDER_MAX_QUEUE", 16))
+    CHART_RENDER_TIMEOUT = float(os.getenv("CHART_RENDER_TIMEOUT", 10))
+
+    # Render budget: figure size (inches) and DPI are clamped to these limits, and
+    # requests whose raster would exceed CHART_MAX_RENDER_BYTES are rejected with 413
+    CHART_MAX_WIDTH = int(os.getenv("CHART_MAX_WIDTH", 24))
+    CHART_MAX_HEIGHT = int(os.getenv("CHART_MAX_HEIGHT", 24))
+    CHART_DEFAULT_DPI = int(os.getenv("CHART_DEFAULT_DPI", 100))
+    CHART_MIN_DPI = int(os.getenv("CHART_MIN_DPI", 20))
+    CHART_MAX_DPI = int(os.getenv("CHART_MAX_DPI", 300))
+    CHART_MAX_RENDER_BYTES = int(os.getenv("CHART_MAX_RENDER_BYTES", 64 * 1024 * 1024))
+
+    # variant=thumb preset for charts: size in inches and DPI
+    CHART_THUMB_SIZE = (4, 3)
+    CHART_THUMB_DPI = int(os.getenv("CHART_THUMB_DPI", 50))
+
+    # Directory of charts pre-rendered by seed/07_prerender_charts.py
+    CHART_PRERENDER_DIR = os.getenv(
+        "CHART_PRERENDER_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "charts"),
+    )
+
+    # Directory of grouped hospital snapshots built by seed/08_build_hospital_snapshots.py
+    HOSPITAL_SNAPSHOT_DIR = os.getenv(
+        "HOSPITAL_SNAPSHOT_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "hospital_snapshots"),
+    )
+
+    # Complaint hotspot scores: half-life of a complaint's weight, beds assumed
+    # for hospitals with fewer (or unknown) beds, and how often each worker
+    # resyncs its in-memory scores with complaint_daily_stats
+    HOTSPOT_HALF_LIFE_DAYS = float(os.getenv("HOTSPOT_HALF_LIFE_DAYS", 30))
+    HOTSPOT_MIN_BEDS = int(os.getenv("HOTSPOT_MIN_BEDS", 10))
+    HOTSPOT_RESYNC_SECONDS = float(os.getenv("HOTSPOT_RESYNC_SECONDS", 60))
@@ -0,0 +1,84 @@
+import time
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from extensions import db
+from models import DataVersion
+
+# Process-local snapshot of the data_version table, refreshed at most every
+# DATA_VERSION_TTL seconds so hot paths don't hit the database per request.
+_snapshot = {"fetched_at": None, "versions": {}, "updated_at": {}}
+
+# Pseudo-table bumped by every applied migration (see migrations/env.py), for
+# responses whose shape or content a schema change may alter
+SCHEMA_TABLE = "schema"
+
+
+def _load_versions():
+    ttl = current_app.config.get("DATA_VERSION_TTL", 2)
+    now = time.monotonic()
+    fetched_at = _snapshot["fetched_at"]
+
+    if fetched_at is None or now - fetched_at > ttl:
+        rows = db.session.query(DataVersion.table_name, DataVersion.version, DataVersion.updated_at).all()
+        _snapshot["versions"] = {r.table_name: r.version for r in rows}
+        _snapshot["updated_at"] = {r.table_name: r.updated_at for r in rows if r.updated_at}
+        _snapshot["fetched_at"] = now
+
+    return _snapshot["versions"]
+
+
+# Returns a token such as "hospital:3|district:2" that changes whenever one of
+# the given tables is reloaded. Used to key caches of derived data.
+def get_data_version(*tables):
+    versions = _load_versions()
+    return "|".join(f"{t}:{versions.get(t, 0)}" for t in tables)
+
+
+# Latest change (naive UTC) of any of the given tables, or None if none is recorded
+def get_last_modified(*tables):
+    _load_versions()
+    updated = [_snapshot["updated_at"][t] for t in tables if t in _snapshot["updated_at"]]
+    return max(updated) if updated else None
+
+
+# Current time as stored in data_version.updated_at (naive UTC)
+def utc_now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Upsert that increments one table's version
+def bump_statement(table_name, now=None):
+    now = now or utc_now()
+    stmt = insert(DataVersion).values(table_name=table_name, version=1, updated_at=now)
+    return stmt.on_conflict_do_update(
+        index_elements=[DataVersion.table_name],
+        set_={"version": DataVersion.version + 1, "updated_at": now},
+    )
+
+
+# Increment the version of the given tables. Call this in the same transaction
+# as the data change (the caller commits), e.g. at the end of a seed loader.
+# This worker's snapshot is dropped once that transaction commits; dropping it
+# earlier would let a concurrent request cache the old versions for the TTL.
+def bump_data_version(*tables):
+    now = utc_now()
+    for table_name in tables:
+        db.session.execute(bump_statement(table_name, now))
+
+    db.session.info["data_version_bumped"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_snapshot_after_bump(session):
+    if session.info.pop("data_version_bumped", False):
+        _snapshot["fetched_at"] = None
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_bump(session):
+    session.info.pop("data_version_bumped", None)
@@ -0,0 +1,151 @@
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+# orjson (requirements.txt) is still imported optionally; without it, or with
+# a version older than 3.9 (no orjson.Fragment), the stdlib encoder is used.
+# bench/hospital_list.py times both.
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# Already encoded JSON (an object, list, ...) that the provider splices into
+# the output verbatim instead of encoding it again. Used for cached rows.
+class JSONFragment:
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text.decode() if isinstance(text, bytes) else text
+
+    def __repr__(self):
+        return f"JSONFragment({self.text[:40]!r})"
+
+
+# Raised from default() to leave the C encoder when the value holds fragments
+class _ContainsFragment(Exception):
+    pass
+
+
+# Encoder for values holding JSONFragments when orjson.Fragment isn't
+# available: walks dicts and lists itself, writes fragment text in place and
+# leaves every other value to the stdlib encoder. Layout follows json.dumps
+# (sort_keys, indent, separators, ensure_ascii, default).
+class _FragmentEncoder:
+    def __init__(self, sort_keys=False, indent=None, separators=None, ensure_ascii=True, default=None, **kwargs):
+        if separators is None:
+            separators = (",", ": ") if indent is not None else (", ", ": ")
+        self.item_separator, self.key_separator = separators
+        self.indent = " " * indent if isinstance(indent, int) else indent
+        self.sort_keys = sort_keys
+        self.default = default
+        self.scalar = json.JSONEncoder(ensure_ascii=ensure_ascii, **kwargs)
+
+    def encode(self, obj):
+        return "".join(self._iterencode(obj, 0))
+
+    def _newline(self, level):
+        return "" if self.indent is None else "\n" + self.indent * level
+
+    def _key(self, key):
+        if isinstance(key, str):
+            return key
+        if isinstance(key, (bool, int, float)) or key is None:
+            return self.scalar.encode(key)
+        raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+    def _iterencode(self, o, level):
+        if isinstance(o, JSONFragment):
+            yield o.text
+        elif isinstance(o, (str, int, float)) or o is None:
+            yield self.scalar.encode(o)
+        elif isinstance(o, dict):
+            items = sorted(o.items()) if self.sort_keys else o.items()
+            if not items:
+                yield "{}"
+                return
+            yield "{"
+            for i, (key, value) in enumerate(items):
+                yield (self.item_separator if i else "") + self._newline(level + 1)
+                yield self.scalar.encode(self._key(key)) + self.key_separator
+                yield from self._iterencode(value, level + 1)
+            yield self._newline(level) + "}"
+        elif isinstance(o, (list, tuple)):
+            if not o:
+                yield "[]"
+                return
+            yield "["
+            for i, value in enumerate(o):
+                yield (self.item_separator if i else "") + self._newline(level + 1)
+                yield from self._iterencode(value, level + 1)
+            yield self._newline(level) + "]"
+        elif self.default is not None:
+            yield from self._iterencode(self.default(o), level)
+        else:
+            raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+
+# Flask JSON provider that encodes with orjson when it is installed and splices
+# JSONFragment values in without re-encoding them. Output matches the default
+# provider (sorted keys, Flask's date format, compact or indented), except that
+# orjson writes non-ASCII characters as UTF-8 instead of \u escapes.
+class FastJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("default", self.default)
+
+        if orjson is not None:
+            text = self._dumps_orjson(obj, kwargs)
+            if text is not None:
+                return text
+
+        default = kwargs["default"]
+
+        def no_fragments(o):
+            if isinstance(o, JSONFragment):
+                raise _ContainsFragment
+            return default(o)
+
+        # The C encoder handles everything without fragments; the first
+        # fragment sends the whole value to _FragmentEncoder instead
+        try:
+            return json.dumps(obj, **{**kwargs, "default": no_fragments})
+        except _ContainsFragment:
+            return _FragmentEncoder(**kwargs).encode(obj)
+
+    # Encode with orjson if it produces the requested layout (compact, or
+    # indent=2 as in debug mode), else None. Fragments need orjson.Fragment
+    # (orjson 3.9+); older versions leave them to the stdlib path.
+    @staticmethod
+    def _dumps_orjson(obj, kwargs):
+        indent = kwargs.get("indent")
+        if indent is None and kwargs.get("separators") != (",", ":"):
+            return None
+        if indent not in (None, 2):
+            return None
+
+        # Dates go through default() so they keep Flask's format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+
+        default = kwargs["default"]
+        fragment = getattr(orjson, "Fragment", None)
+
+        def orjson_default(o):
+            if isinstance(o, JSONFragment):
+                if fragment is None:
+                    raise _ContainsFragment
+                return fragment(o.text)
+            return default(o)
+
+        try:
+            return orjson.dumps(obj, default=orjson_default, option=option).decode()
+        except TypeError:
+            # Values orjson can't take (e.g. ints over 64 bits, or fragments
+            # without orjson.Fragment); let json raise or cope
+            return None
@@ -90,9 +90,20 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # every applied (or reverted) revision bumps the schema data version, in
+    # the same transaction, so cached responses and ETags are invalidated.
+    # Revisions older than the data_version table have nothing to bump.
+    def on_version_apply(ctx, step, heads, run_args):
+        from sqlalchemy import inspect
+        from data_version import SCHEMA_TABLE, bump_statement
+        if inspect(ctx.connection).has_table("data_version"):
+            ctx.connection.execute(bump_statement(SCHEMA_TABLE))
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("on_version_apply") is None:
+        conf_args["on_version_apply"] = on_version_apply
 
     connectable = get_engine()
 
@@ -0,0 +1,55 @@
+"""create complaint_daily_stats table
+
+Revision ID: 02660cac1655
+Revises: c81f5a2d4e70
+Create Date: 2026-10-17 12:38:02.335635
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '02660cac1655'
+down_revision = 'c81f5a2d4e70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('complaint_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('state_id', sa.Integer(), nullable=False),
+    sa.Column('district_id', sa.Integer(), nullable=False),
+    sa.Column('hospital_id', sa.Integer(), nullable=False),
+    sa.Column('num_complaints', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('day', 'state_id', 'district_id', 'hospital_id')
+    )
+    with op.batch_alter_table('complaint_daily_stats', schema=None) as batch_op:
+        batch_op.create_index('idx_complaint_daily_stats_district_day', ['district_id', 'day'], unique=False)
+        batch_op.create_index('idx_complaint_daily_stats_hospital_day', ['hospital_id', 'day'], unique=False)
+        batch_op.create_index('idx_complaint_daily_stats_state_day', ['state_id', 'day'], unique=False)
+
+    # Backfill from existing complaints; new ones are counted by services.complaint_stats
+    op.execute("""
+        INSERT INTO complaint_daily_stats (day, state_id, district_id, hospital_id, num_complaints, updated_at)
+        SELECT
+            CAST(COALESCE(created_at, now() AT TIME ZONE 'utc') AS date),
+            COALESCE(state_id, 0),
+            COALESCE(district_id, 0),
+            COALESCE(hospital_id, 0),
+            COUNT(*),
+            now() AT TIME ZONE 'utc'
+        FROM complaint
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('complaint_daily_stats', schema=None) as batch_op:
+        batch_op.drop_index('idx_complaint_daily_stats_state_day')
+        batch_op.drop_index('idx_complaint_daily_stats_hospital_day')
+        batch_op.drop_index('idx_complaint_daily_stats_district_day')
+
+    op.drop_table('complaint_daily_stats')
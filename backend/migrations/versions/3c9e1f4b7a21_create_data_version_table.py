@@ -0,0 +1,34 @@
+"""create data_version table
+
+Revision ID: 3c9e1f4b7a21
+Revises: 08f477671ff9
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1f4b7a21'
+down_revision = '08f477671ff9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('data_version',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+    op.execute(
+        "INSERT INTO data_version (table_name, version, updated_at) "
+        "SELECT t, 1, now() FROM unnest(ARRAY['state', 'district', 'hospital', 'category', 'hospital_category']) AS t"
+    )
+
+
+def downgrade():
+    op.drop_table('data_version')
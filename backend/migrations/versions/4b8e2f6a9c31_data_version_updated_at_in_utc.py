@@ -0,0 +1,28 @@
+"""data_version updated_at in utc
+
+Revision ID: 4b8e2f6a9c31
+Revises: e900b839ebcd
+Create Date: 2026-10-17 14:05:12.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8e2f6a9c31'
+down_revision = 'e900b839ebcd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Earlier revisions seeded updated_at with now() in the server's time zone,
+    # while the app reads it as naive UTC. Which rows still hold a seeded value
+    # can't be told apart, so move every row to the current UTC time: clients
+    # refetch once instead of possibly getting a 304 for changed data.
+    op.execute("UPDATE data_version SET updated_at = now() AT TIME ZONE 'utc'")
+
+
+def downgrade():
+    pass
@@ -0,0 +1,94 @@
+"""create district_stats table
+
+Revision ID: 7a4d2c8e9b13
+Revises: 3c9e1f4b7a21
+Create Date: 2026-10-17 14:02:19.550731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '7a4d2c8e9b13'
+down_revision = '3c9e1f4b7a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('district_stats',
+    sa.Column('district_id', sa.Integer(), nullable=False),
+    sa.Column('state_id', sa.Integer(), nullable=False),
+    sa.Column('district_name', sa.String(length=256), nullable=False),
+    sa.Column('num_hospitals', sa.Integer(), nullable=False),
+    sa.Column('total_beds', sa.Integer(), nullable=False),
+    sa.Column('hospitals_by_type', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('total_persons', sa.Integer(), nullable=True),
+    sa.Column('total_males', sa.Integer(), nullable=True),
+    sa.Column('total_females', sa.Integer(), nullable=True),
+    sa.Column('children_persons', sa.Integer(), nullable=True),
+    sa.Column('beds_per_10k', sa.Float(), nullable=False),
+    sa.Column('hospitals_per_100k', sa.Float(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['district_id'], ['district.district_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['state_id'], ['state.state_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('district_id')
+    )
+    with op.batch_alter_table('district_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_district_stats_state_id'), ['state_id'], unique=False)
+
+    # Initial fill from existing data (same query as services.district_stats)
+    op.execute("""
+        INSERT INTO district_stats (
+            district_id, state_id, district_name,
+            num_hospitals, total_beds, hospitals_by_type,
+            total_persons, total_males, total_females, children_persons,
+            beds_per_10k, hospitals_per_100k, refreshed_at
+        )
+        SELECT
+            d.district_id,
+            d.state_id,
+            d.district_name,
+            COALESCE(h.num_hospitals, 0),
+            COALESCE(h.total_beds, 0),
+            COALESCE(t.hospitals_by_type, '{}'::jsonb),
+            d.total_persons,
+            d.total_males,
+            d.total_females,
+            d.children_persons,
+            CASE WHEN d.total_persons > 0
+                 THEN COALESCE(h.total_beds, 0) * 10000.0 / d.total_persons ELSE 0 END,
+            CASE WHEN d.total_persons > 0
+                 THEN COALESCE(h.num_hospitals, 0) * 100000.0 / d.total_persons ELSE 0 END,
+            now() AT TIME ZONE 'utc'
+        FROM district d
+        LEFT JOIN (
+            SELECT district_id,
+                   COUNT(*) AS num_hospitals,
+                   SUM(COALESCE(total_beds, 0)) AS total_beds
+            FROM hospital
+            GROUP BY district_id
+        ) h ON h.district_id = d.district_id
+        LEFT JOIN (
+            SELECT district_id, jsonb_object_agg(hospital_type, num_hospitals) AS hospitals_by_type
+            FROM (
+                SELECT district_id, COALESCE(hospital_type, 'Unknown') AS hospital_type, COUNT(*) AS num_hospitals
+                FROM hospital
+                GROUP BY 1, 2
+            ) by_type
+            GROUP BY district_id
+        ) t ON t.district_id = d.district_id
+    """)
+    op.execute(
+        "INSERT INTO data_version (table_name, version, updated_at) VALUES ('district_stats', 1, now()) "
+        "ON CONFLICT (table_name) DO NOTHING"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('district_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_district_stats_state_id'))
+
+    op.drop_table('district_stats')
+    op.execute("DELETE FROM data_version WHERE table_name = 'district_stats'")
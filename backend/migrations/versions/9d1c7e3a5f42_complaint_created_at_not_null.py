@@ -0,0 +1,31 @@
+"""complaint created_at not null
+
+Revision ID: 9d1c7e3a5f42
+Revises: 4b8e2f6a9c31
+Create Date: 2026-10-17 15:21:47.103582
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d1c7e3a5f42'
+down_revision = '4b8e2f6a9c31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # created_at is part of the complaint cursor key, which can't hold NULL.
+    # Complaints without one get the same time the daily stats backfill
+    # counted them under.
+    op.execute("UPDATE complaint SET created_at = now() AT TIME ZONE 'utc' WHERE created_at IS NULL")
+
+    with op.batch_alter_table('complaint', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('complaint', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,44 @@
+"""create district_accessibility table
+
+Revision ID: b5e07d3f61a8
+Revises: 7a4d2c8e9b13
+Create Date: 2026-10-17 16:47:03.912284
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e07d3f61a8'
+down_revision = '7a4d2c8e9b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('district_accessibility',
+    sa.Column('district_id', sa.Integer(), nullable=False),
+    sa.Column('scope', sa.String(length=128), nullable=False),
+    sa.Column('state_id', sa.Integer(), nullable=False),
+    sa.Column('district_name', sa.String(length=256), nullable=False),
+    sa.Column('total_persons', sa.Integer(), nullable=True),
+    sa.Column('n_nearest', sa.Integer(), nullable=False),
+    sa.Column('nearest_km', sa.Float(), nullable=True),
+    sa.Column('mean_nearest_km', sa.Float(), nullable=True),
+    sa.Column('radius_km', sa.Float(), nullable=False),
+    sa.Column('hospitals_within_radius', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['district_id'], ['district.district_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['state_id'], ['state.state_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('district_id', 'scope')
+    )
+    with op.batch_alter_table('district_accessibility', schema=None) as batch_op:
+        batch_op.create_index('idx_district_accessibility_scope_state', ['scope', 'state_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('district_accessibility', schema=None) as batch_op:
+        batch_op.drop_index('idx_district_accessibility_scope_state')
+
+    op.drop_table('district_accessibility')
@@ -0,0 +1,98 @@
+"""create state_stats table
+
+Revision ID: c81f5a2d4e70
+Revises: b5e07d3f61a8
+Create Date: 2026-10-17 18:21:55.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c81f5a2d4e70'
+down_revision = 'b5e07d3f61a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('state_stats',
+    sa.Column('state_id', sa.Integer(), nullable=False),
+    sa.Column('state_name', sa.String(length=128), nullable=False),
+    sa.Column('num_districts', sa.Integer(), nullable=False),
+    sa.Column('num_hospitals', sa.Integer(), nullable=False),
+    sa.Column('total_beds', sa.Integer(), nullable=False),
+    sa.Column('hospitals_by_type', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('total_persons', sa.BigInteger(), nullable=True),
+    sa.Column('total_males', sa.BigInteger(), nullable=True),
+    sa.Column('total_females', sa.BigInteger(), nullable=True),
+    sa.Column('children_persons', sa.BigInteger(), nullable=True),
+    sa.Column('beds_per_10k', sa.Float(), nullable=False),
+    sa.Column('hospitals_per_100k', sa.Float(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['state_id'], ['state.state_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('state_id')
+    )
+
+    # Initial fill from existing data (same query as services.district_stats)
+    op.execute("""
+        INSERT INTO state_stats (
+            state_id, state_name,
+            num_districts, num_hospitals, total_beds, hospitals_by_type,
+            total_persons, total_males, total_females, children_persons,
+            beds_per_10k, hospitals_per_100k, refreshed_at
+        )
+        SELECT
+            s.state_id,
+            s.state_name,
+            COALESCE(d.num_districts, 0),
+            COALESCE(h.num_hospitals, 0),
+            COALESCE(h.total_beds, 0),
+            COALESCE(t.hospitals_by_type, '{}'::jsonb),
+            d.total_persons,
+            d.total_males,
+            d.total_females,
+            d.children_persons,
+            CASE WHEN d.total_persons > 0
+                 THEN COALESCE(h.total_beds, 0) * 10000.0 / d.total_persons ELSE 0 END,
+            CASE WHEN d.total_persons > 0
+                 THEN COALESCE(h.num_hospitals, 0) * 100000.0 / d.total_persons ELSE 0 END,
+            now() AT TIME ZONE 'utc'
+        FROM state s
+        LEFT JOIN (
+            SELECT state_id,
+                   COUNT(*) AS num_districts,
+                   SUM(total_persons) AS total_persons,
+                   SUM(total_males) AS total_males,
+                   SUM(total_females) AS total_females,
+                   SUM(children_persons) AS children_persons
+            FROM district
+            GROUP BY state_id
+        ) d ON d.state_id = s.state_id
+        LEFT JOIN (
+            SELECT state_id,
+                   COUNT(*) AS num_hospitals,
+                   SUM(COALESCE(total_beds, 0)) AS total_beds
+            FROM hospital
+            GROUP BY state_id
+        ) h ON h.state_id = s.state_id
+        LEFT JOIN (
+            SELECT state_id, jsonb_object_agg(hospital_type, num_hospitals) AS hospitals_by_type
+            FROM (
+                SELECT state_id, COALESCE(hospital_type, 'Unknown') AS hospital_type, COUNT(*) AS num_hospitals
+                FROM hospital
+                GROUP BY 1, 2
+            ) by_type
+            GROUP BY state_id
+        ) t ON t.state_id = s.state_id
+    """)
+    op.execute(
+        "INSERT INTO data_version (table_name, version, updated_at) VALUES ('state_stats', 1, now()) "
+        "ON CONFLICT (table_name) DO NOTHING"
+    )
+
+
+def downgrade():
+    op.drop_table('state_stats')
+    op.execute("DELETE FROM data_version WHERE table_name = 'state_stats'")
@@ -124,6 +124,8 @@ class Hospital(db.Model):
 
     __table_args__ = (
         db.PrimaryKeyConstraint("hospital_id", "state_id"),
+        # Key of cursor pages of /api/hospitals
+        db.Index("idx_hospital_name_key", "hospital_name", "state_id", "hospital_id"),
     )
 
     district = db.relationship("District", back_populates="hospitals")
@@ -170,6 +172,166 @@ class Category(db.Model):
             "category_name": self.category_name,
         }
 
+################### Derived statistics
+
+# Per-district rollup of District + Hospital, rebuilt by services.district_stats
+# after data loads. Charts and analytics read this instead of aggregating hospitals.
+class DistrictStats(db.Model):
+    __tablename__ = "district_stats"
+
+    district_id = db.Column(
+        db.Integer,
+        db.ForeignKey("district.district_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    state_id = db.Column(
+        db.Integer,
+        db.ForeignKey("state.state_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    district_name = db.Column(db.String(256), nullable=False)
+
+    num_hospitals = db.Column(db.Integer, nullable=False, default=0)
+    total_beds = db.Column(db.Integer, nullable=False, default=0)
+    hospitals_by_type = db.Column(JSONB, nullable=False, default=dict)
+
+    total_persons = db.Column(db.Integer, nullable=True)
+    total_males = db.Column(db.Integer, nullable=True)
+    total_females = db.Column(db.Integer, nullable=True)
+    children_persons = db.Column(db.Integer, nullable=True)
+
+    beds_per_10k = db.Column(db.Float, nullable=False, default=0)
+    hospitals_per_100k = db.Column(db.Float, nullable=False, default=0)
+
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "district_id": self.district_id,
+            "state_id": self.state_id,
+            "district_name": self.district_name,
+            "num_hospitals": self.num_hospitals,
+            "total_beds": self.total_beds,
+            "hospitals_by_type": self.hospitals_by_type or {},
+            "total_persons": self.total_persons,
+            "total_males": self.total_males,
+            "total_females": self.total_females,
+            "children_persons": self.children_persons,
+            "beds_per_10k": self.beds_per_10k,
+            "hospitals_per_100k": self.hospitals_per_100k,
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
+
+# Per-state rollup of State + District + Hospital, rebuilt by
+# services.district_stats alongside district_stats. Backs the cross-state
+# comparison endpoints with one indexed read.
+class StateStats(db.Model):
+    __tablename__ = "state_stats"
+
+    state_id = db.Column(
+        db.Integer,
+        db.ForeignKey("state.state_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    state_name = db.Column(db.String(128), nullable=False)
+
+    num_districts = db.Column(db.Integer, nullable=False, default=0)
+    num_hospitals = db.Column(db.Integer, nullable=False, default=0)
+    total_beds = db.Column(db.Integer, nullable=False, default=0)
+    hospitals_by_type = db.Column(JSONB, nullable=False, default=dict)
+
+    total_persons = db.Column(db.BigInteger, nullable=True)
+    total_males = db.Column(db.BigInteger, nullable=True)
+    total_females = db.Column(db.BigInteger, nullable=True)
+    children_persons = db.Column(db.BigInteger, nullable=True)
+
+    beds_per_10k = db.Column(db.Float, nullable=False, default=0)
+    hospitals_per_100k = db.Column(db.Float, nullable=False, default=0)
+
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "state_id": self.state_id,
+            "state_name": self.state_name,
+            "num_districts": self.num_districts,
+            "num_hospitals": self.num_hospitals,
+            "total_beds": self.total_beds,
+            "hospitals_by_type": self.hospitals_by_type or {},
+            "total_persons": self.total_persons,
+            "total_males": self.total_males,
+            "total_females": self.total_females,
+            "children_persons": self.children_persons,
+            "beds_per_10k": self.beds_per_10k,
+            "hospitals_per_100k": self.hospitals_per_100k,
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
+
+# Distance from each district's centroid to its nearest hospitals, per scope
+# of facilities. Written by services.accessibility (seed/06_compute_accessibility.py).
+#   scope: "all", "type:<hospital_type>" or "category:<category_id>"
+class DistrictAccessibility(db.Model):
+    __tablename__ = "district_accessibility"
+
+    district_id = db.Column(
+        db.Integer,
+        db.ForeignKey("district.district_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    scope = db.Column(db.String(128), primary_key=True)
+    state_id = db.Column(
+        db.Integer,
+        db.ForeignKey("state.state_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    district_name = db.Column(db.String(256), nullable=False)
+    total_persons = db.Column(db.Integer, nullable=True)
+
+    n_nearest = db.Column(db.Integer, nullable=False)
+    nearest_km = db.Column(db.Float, nullable=True)
+    mean_nearest_km = db.Column(db.Float, nullable=True)
+    radius_km = db.Column(db.Float, nullable=False)
+    hospitals_within_radius = db.Column(db.Integer, nullable=False, default=0)
+
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("idx_district_accessibility_scope_state", "scope", "state_id"),
+    )
+
+    def to_dict(self):
+        return {
+            "district_id": self.district_id,
+            "scope": self.scope,
+            "state_id": self.state_id,
+            "district_name": self.district_name,
+            "total_persons": self.total_persons,
+            "n_nearest": self.n_nearest,
+            "nearest_km": self.nearest_km,
+            "mean_nearest_km": self.mean_nearest_km,
+            "radius_km": self.radius_km,
+            "hospitals_within_radius": self.hospitals_within_radius,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
+
+################### Data versioning
+
+# One row per table; version is bumped whenever the table's data is reloaded
+class DataVersion(db.Model):
+    __tablename__ = "data_version"
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "table_name": self.table_name,
+            "version": self.version,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
 ################### Complaints Model
 
 class User(db.Model):
@@ -208,7 +370,7 @@ class Complaint(db.Model):
     details = db.Column(db.Text, nullable=True)
 
     # Metadata
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
@@ -216,9 +378,11 @@ class Complaint(db.Model):
     district = db.relationship("District", backref="complaints", lazy=True)
 
     __table_args__ = (
-        db.Index("idx_complaints_state", "state_id"),
-        db.Index("idx_complaints_district", "district_id"),
-        db.Index("idx_complaints_hospital", "hospital_id"),
+        # Filter column(s) + the cursor key (created_at, complaint_id) of /api/complaints
+        db.Index("idx_complaints_created", "created_at", "complaint_id"),
+        db.Index("idx_complaints_state_created", "state_id", "created_at", "complaint_id"),
+        db.Index("idx_complaints_district_created", "district_id", "created_at", "complaint_id"),
+        db.Index("idx_complaints_hospital_created", "hospital_id", "created_at", "complaint_id"),
     )
 
     def to_dict(self):
@@ -234,3 +398,33 @@ class Complaint(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+# Complaints per day per (state, district, hospital), maintained incrementally
+# by services.complaint_stats when a complaint is created. 0 stands for a
+# missing reference so the key can be the primary key.
+class ComplaintDailyStats(db.Model):
+    __tablename__ = "complaint_daily_stats"
+
+    day = db.Column(db.Date, primary_key=True)
+    state_id = db.Column(db.Integer, primary_key=True, default=0)
+    district_id = db.Column(db.Integer, primary_key=True, default=0)
+    hospital_id = db.Column(db.Integer, primary_key=True, default=0)
+
+    num_complaints = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("idx_complaint_daily_stats_state_day", "state_id", "day"),
+        db.Index("idx_complaint_daily_stats_district_day", "district_id", "day"),
+        db.Index("idx_complaint_daily_stats_hospital_day", "hospital_id", "day"),
+    )
+
+    def to_dict(self):
+        return {
+            "day": self.day.isoformat() if self.day else None,
+            "state_id": self.state_id or None,
+            "district_id": self.district_id or None,
+            "hospital_id": self.hospital_id or None,
+            "num_complaints": self.num_complaints,
+        }
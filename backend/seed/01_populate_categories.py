@@ -6,6 +6,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app import app
 from extensions import db
+from data_version import bump_data_version
 from models import Category
 
 # Path to your CSV file
@@ -30,6 +31,7 @@ def populate_categories():
                 )
                 db.session.add(category)
 
+            bump_data_version("category")
             db.session.commit()
             print("Categories table populated successfully!")
 
@@ -7,6 +7,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app import app
 from extensions import db
+from data_version import bump_data_version
+from services.district_stats import refresh_state_stats
 from models import State
 
 # Path to your CSV file
@@ -63,6 +65,8 @@ def populate_states():
                 db.session.add(state)
                 count_inserted += 1
 
+            bump_data_version("state")
+            refresh_state_stats()
             db.session.commit()
 
             print("\nStates table populated successfully!")
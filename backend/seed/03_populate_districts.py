@@ -7,6 +7,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app import app
 from extensions import db
+from data_version import bump_data_version
+from services.district_stats import refresh_district_stats, refresh_state_stats
 from models import District, State
 
 # Path to your CSV file
@@ -88,6 +90,9 @@ def populate_districts():
                 db.session.add(district)
                 count_inserted += 1
 
+            bump_data_version("district")
+            refresh_district_stats()
+            refresh_state_stats()
             db.session.commit()
 
             print("Districts table populated successfully!")
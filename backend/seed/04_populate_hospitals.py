@@ -7,6 +7,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app import app
 from extensions import db
+from data_version import bump_data_version
+from services.district_stats import refresh_district_stats, refresh_state_stats
 from models import Hospital, State, District
 
 # --- Config ---
@@ -107,6 +109,9 @@ def populate_hospitals():
                 db.session.add(hospital)
                 count_inserted += 1
 
+            bump_data_version("hospital")
+            refresh_district_stats()
+            refresh_state_stats()
             db.session.commit()
 
             print("Hospitals table populated successfully!")
@@ -7,6 +7,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app import app
 from extensions import db
+from data_version import bump_data_version
 from models import Hospital, Category, State, hospital_category
 
 CSV_FILE = "../data/maharashtra/hospital_category.csv"
@@ -81,6 +82,7 @@ def populate_hospital_categories():
                 )
                 inserted += 1
 
+            bump_data_version("hospital_category")
             db.session.commit()
             print("Hospital–Category associations populated successfully!")
             print(f"Inserted: {inserted}")
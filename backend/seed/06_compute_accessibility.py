@@ -0,0 +1,37 @@
+import argparse
+import os
+import sys
+
+# Ensure we can import app + models
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import app
+from extensions import db
+from services.accessibility import compute_accessibility
+
+# Recompute distances from district centroids to the nearest hospitals (overall,
+# per hospital_type and per category). Run after the 0x_populate_* loaders.
+#
+#   python seed/06_compute_accessibility.py --nearest 3 --radius-km 25
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compute district accessibility to hospitals.")
+    parser.add_argument("--nearest", type=int, default=3, help="Average over the N nearest hospitals (default: 3)")
+    parser.add_argument("--radius-km", type=float, default=25.0, help="Count hospitals within this radius (default: 25)")
+    return parser.parse_args()
+
+
+def populate_accessibility():
+    args = parse_args()
+
+    with app.app_context():
+        count = compute_accessibility(n=args.nearest, radius_km=args.radius_km)
+        db.session.commit()
+
+        print("District accessibility computed successfully!")
+        print(f"Rows written: {count}")
+
+
+if __name__ == "__main__":
+    populate_accessibility()
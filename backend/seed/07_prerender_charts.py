@@ -0,0 +1,128 @@
+import argparse
+import os
+import sys
+from multiprocessing import get_context
+
+# Ensure we can import app + models
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import app
+from models import State
+from data_version import get_data_version
+from api.charts import CHART_FORMATS, CHART_TABLES, chart_cache_key, chart_style, encode_chart
+from services.chart_renderer import render_spec
+from services.output_dir import check_output_dir
+from services.prerendered import MANIFEST_NAME, write_artifacts
+
+# Pre-render every /api/charts chart for every state so the API can serve them
+# from disk right after a data load. Run last, after the loaders and
+# 06_compute_accessibility.py.
+#
+#   python seed/07_prerender_charts.py --formats png,webp --variants full,thumb
+
+# Charts drawn once for the whole country
+GLOBAL_CHARTS = [
+    "beds",
+    "state-district-hospitals-vs-population",
+    "states-hospitals",
+    "states-beds",
+    "states-population",
+    "states-bed-ratio",
+    "states-hospital-ratio",
+]
+
+# Charts drawn for each state (?state_id=)
+STATE_CHARTS = [
+    "beds",
+    "state-district-hospitals",
+    "state-district-beds",
+    "state-district-population",
+    "state-district-hospitals-vs-population",
+    "state-district-bed-ratio",
+    "state-district-accessibility",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pre-render chart images for all states.")
+    parser.add_argument("--formats", default="png", help="Comma separated: png,webp,svg,json (default: png)")
+    parser.add_argument("--variants", default="full,thumb", help="Comma separated: full,thumb (default: full,thumb)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Render processes")
+    parser.add_argument("--out", default=None, help="Output directory (default: CHART_PRERENDER_DIR)")
+    return parser.parse_args()
+
+
+# Run the chart view for one request and return the job to encode, or None when
+# the chart has no data (e.g. a state without districts)
+def build_job(chart, query, fmt, variant):
+    query = {**query, "format": fmt, "variant": variant}
+
+    with app.test_request_context(f"/api/charts/{chart}", query_string=query):
+        view = app.view_functions[app.url_map.bind("").match(f"/api/charts/{chart}")[0]]
+        series = view.__wrapped__()
+        if not isinstance(series, dict):
+            return None
+
+        name = "-".join([chart] + [f"{k}{v}" for k, v in sorted(query.items()) if k != "format"])
+        job = {
+            "key": chart_cache_key(fmt),
+            "name": name,
+            "ext": fmt,
+            "mimetype": CHART_FORMATS[fmt],
+        }
+
+        if fmt == "json":
+            job["body"] = encode_chart(series, fmt)
+        else:
+            job["spec"] = {**chart_style(), **series, "format": fmt}
+        return job
+
+
+def render_job(job):
+    if "body" not in job:
+        job["body"] = render_spec(job.pop("spec"))
+    return job
+
+
+def prerender_charts():
+    args = parse_args()
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+
+    with app.app_context():
+        out_dir = args.out or app.config["CHART_PRERENDER_DIR"]
+        # Fail before rendering anything rather than when writing
+        try:
+            check_output_dir(out_dir, MANIFEST_NAME)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+        data_version = get_data_version(*CHART_TABLES)
+        state_ids = [s.state_id for s in State.query.order_by(State.state_id).all()]
+
+        requests = [(chart, {}) for chart in GLOBAL_CHARTS]
+        requests += [(chart, {"state_id": sid}) for sid in state_ids for chart in STATE_CHARTS]
+
+        jobs, count_skipped = [], 0
+        for chart, query in requests:
+            for fmt in formats:
+                for variant in variants:
+                    job = build_job(chart, query, fmt, variant)
+                    if job is None:
+                        count_skipped += 1
+                        continue
+                    jobs.append(job)
+
+    print(f"Rendering {len(jobs)} charts with {args.processes} processes...")
+    with get_context("spawn").Pool(args.processes) as pool:
+        artifacts = list(pool.imap_unordered(render_job, jobs, chunksize=4))
+
+    charts, count_removed = write_artifacts(out_dir, artifacts, data_version)
+
+    print("Charts pre-rendered successfully!")
+    print(f"Written: {len(charts)} (data version {data_version}) to {out_dir}")
+    print(f"Skipped (no data): {count_skipped}")
+    print(f"Removed (stale files): {count_removed}")
+
+
+if __name__ == "__main__":
+    prerender_charts()
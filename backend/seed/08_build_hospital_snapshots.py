@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+
+# Ensure we can import app + models
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import app
+from models import State
+from data_version import get_data_version
+from services.hospital_snapshots import SNAPSHOT_TABLES, write_snapshots
+
+# Build the per-state deflate snapshots behind /api/hospitals/grouped so workers
+# stream them from disk instead of building them on first request. Run after
+# the loaders.
+#
+#   python seed/08_build_hospital_snapshots.py
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build grouped hospital snapshots for all states.")
+    parser.add_argument("--out", default=None, help="Output directory (default: HOSPITAL_SNAPSHOT_DIR)")
+    return parser.parse_args()
+
+
+def build_hospital_snapshots():
+    args = parse_args()
+
+    with app.app_context():
+        out_dir = args.out or app.config["HOSPITAL_SNAPSHOT_DIR"]
+        data_version = get_data_version(*SNAPSHOT_TABLES)
+        states = State.query.order_by(State.state_id).all()
+
+        try:
+            manifest, count_removed = write_snapshots(out_dir, states, data_version)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+
+    print("Hospital snapshots built successfully!")
+    print(f"Written: {len(manifest)} states (data version {data_version}) to {out_dir}")
+    print(f"Uncompressed: {sum(e['bytes'] for e in manifest.values())} bytes")
+    print(f"Removed (stale files): {count_removed}")
+
+
+if __name__ == "__main__":
+    build_hospital_snapshots()
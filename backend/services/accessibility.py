@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import delete, insert
+
+from extensions import db
+from models import District, Hospital, DistrictAccessibility, hospital_category
+from data_version import bump_data_version
+from services.hospital_index import to_unit_xyz, chord_to_km, km_to_chord
+
+
+# For each scope (a boolean mask over the destinations) and each source point:
+# distance to the nearest destination in the scope, mean distance to its n
+# nearest, and number within radius_km. Sources are processed in chunks; each
+# chunk's squared chord matrix (chunk x len(dst), one matrix product) is
+# computed once and shared by every scope. The chord orders points like the
+# great-circle distance; the n nearest per scope are then measured exactly
+# from the vector difference (2 - 2 * dot loses precision for close points).
+# Returns {scope: (nearest, mean_n, within)}.
+def nearest_distances(src_lat, src_lon, dst_lat, dst_lon, scopes, n=3, radius_km=25.0, chunk=256):
+    count = len(src_lat)
+    results = {
+        scope: (np.full(count, np.nan), np.full(count, np.nan), np.zeros(count, dtype=int))
+        for scope, _ in scopes
+    }
+    columns = [(scope, np.flatnonzero(mask)) for scope, mask in scopes]
+
+    src = to_unit_xyz(src_lat, src_lon)
+    dst = to_unit_xyz(dst_lat, dst_lon)
+    radius_chord_sq = km_to_chord(radius_km) ** 2
+
+    for start in range(0, count, chunk):
+        stop = min(start + chunk, count)
+        chord_sq = 2.0 - 2.0 * (src[start:stop] @ dst.T)
+
+        for scope, idx in columns:
+            if len(idx) == 0:
+                continue
+            nearest, mean_n, within = results[scope]
+            scoped = chord_sq[:, idx]
+
+            k = min(n, len(idx))
+            closest = idx[np.argpartition(scoped, k - 1, axis=1)[:, :k]]
+            smallest = chord_to_km(np.linalg.norm(dst[closest] - src[start:stop, None, :], axis=2))
+            nearest[start:stop] = smallest.min(axis=1)
+            mean_n[start:stop] = smallest.mean(axis=1)
+            within[start:stop] = (scoped <= radius_chord_sq).sum(axis=1)
+
+    return results
+
+
+# Hospital subsets to measure access to: all hospitals, each hospital_type and
+# each category. Yields (scope, boolean mask over the hospital arrays).
+def accessibility_scopes(hospitals, category_links):
+    yield "all", np.ones(len(hospitals), dtype=bool)
+
+    types = np.array([h.hospital_type or "Unknown" for h in hospitals], dtype=object)
+    for hospital_type in sorted(set(types)):
+        yield f"type:{hospital_type}", types == hospital_type
+
+    position = {(h.hospital_id, h.state_id): i for i, h in enumerate(hospitals)}
+    by_category = {}
+    for link in category_links:
+        i = position.get((link.hospital_id, link.state_id))
+        if i is not None:
+            by_category.setdefault(link.category_id, []).append(i)
+
+    for category_id in sorted(by_category):
+        mask = np.zeros(len(hospitals), dtype=bool)
+        mask[by_category[category_id]] = True
+        yield f"category:{category_id}", mask
+
+
+# Recompute district_accessibility for every district with a centroid.
+# Runs in the caller's transaction; returns the number of rows written.
+def compute_accessibility(n=3, radius_km=25.0):
+    districts = (
+        db.session.query(
+            District.district_id, District.state_id, District.district_name,
+            District.total_persons, District.latitude, District.longitude,
+        )
+        .filter(District.latitude.isnot(None), District.longitude.isnot(None))
+        .order_by(District.district_id)
+        .all()
+    )
+    hospitals = (
+        db.session.query(
+            Hospital.hospital_id, Hospital.state_id, Hospital.hospital_type,
+            Hospital.latitude, Hospital.longitude,
+        )
+        .filter(Hospital.latitude.isnot(None), Hospital.longitude.isnot(None))
+        .all()
+    )
+    category_links = db.session.execute(db.select(hospital_category)).all()
+
+    src_lat = np.array([d.latitude for d in districts], dtype=float)
+    src_lon = np.array([d.longitude for d in districts], dtype=float)
+    dst_lat = np.array([h.latitude for h in hospitals], dtype=float)
+    dst_lon = np.array([h.longitude for h in hospitals], dtype=float)
+
+    scopes = list(accessibility_scopes(hospitals, category_links))
+    results = nearest_distances(src_lat, src_lon, dst_lat, dst_lon, scopes, n=n, radius_km=radius_km)
+
+    now = datetime.utcnow()
+    rows = []
+    for scope, _ in scopes:
+        nearest, mean_n, within = results[scope]
+        for i, d in enumerate(districts):
+            rows.append({
+                "district_id": d.district_id,
+                "scope": scope,
+                "state_id": d.state_id,
+                "district_name": d.district_name,
+                "total_persons": d.total_persons,
+                "n_nearest": n,
+                "nearest_km": None if np.isnan(nearest[i]) else float(nearest[i]),
+                "mean_nearest_km": None if np.isnan(mean_n[i]) else float(mean_n[i]),
+                "radius_km": radius_km,
+                "hospitals_within_radius": int(within[i]),
+                "computed_at": now,
+            })
+
+    db.session.execute(delete(DistrictAccessibility))
+    if rows:
+        db.session.execute(insert(DistrictAccessibility), rows)
+    bump_data_version("district_accessibility")
+    return len(rows)
+
+
+# Population-weighted mean of a per-district distance over the given rows
+# (rows without a distance or population are skipped)
+def population_weighted_km(rows, attr="mean_nearest_km"):
+    values = [(getattr(r, attr), r.total_persons) for r in rows]
+    values = [(v, p) for v, p in values if v is not None and p]
+    if not values:
+        return None
+
+    km, weights = np.array(values, dtype=float).T
+    return float(np.average(km, weights=weights))
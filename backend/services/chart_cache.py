@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from threading import Lock
+
+from flask import current_app
+
+
+# Bounded LRU of rendered chart bodies, keyed by the normalized chart request.
+# Evicts least recently used entries once either the entry count or the total
+# byte size goes over its limit.
+class ChartCache:
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body, mimetype):
+        entry = {"body": body, "mimetype": mimetype}
+        if len(body) > self.max_bytes:
+            return entry
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old["body"])
+
+            self._entries[key] = entry
+            self._size += len(body)
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted["body"])
+
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# One cache per Flask app, sized from CHART_CACHE_MAX_ENTRIES / CHART_CACHE_MAX_BYTES
+def get_chart_cache():
+    cache = current_app.extensions.get("chart_cache")
+    if cache is None:
+        cache = ChartCache(
+            max_entries=current_app.config.get("CHART_CACHE_MAX_ENTRIES", 256),
+            max_bytes=current_app.config.get("CHART_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        )
+        current_app.extensions["chart_cache"] = cache
+    return cache
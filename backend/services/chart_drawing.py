@@ -0,0 +1,106 @@
+# Matplotlib drawing for chart specs. Only imported where charts are actually
+# drawn (render pool workers, inline rendering, the pre-render script).
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")
+# Fixed salt so SVG element ids, and therefore the bytes, are the same for equal inputs
+matplotlib.rcParams["svg.hashsalt"] = "equihealth"
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+
+from services.label_placer import declutter_labels
+
+# Uses the object-oriented Figure API instead of pyplot, so no global figure
+# state is shared between renders.
+def _new_figure(spec):
+    fig = Figure(figsize=spec["size"], dpi=spec.get("dpi", 100))
+    ax = fig.subplots()
+
+    bg_color = spec.get("bg_color")
+    if bg_color:
+        fig.patch.set_facecolor(bg_color)
+        ax.set_facecolor(bg_color)
+
+    return fig, ax
+
+
+def _style_axes(ax, spec):
+    text_color = spec.get("text_color") or "black"
+    ax.set_title(spec.get("title", ""), color=text_color)
+    if spec.get("xlabel"):
+        ax.set_xlabel(spec["xlabel"], color=text_color)
+    if spec.get("ylabel"):
+        ax.set_ylabel(spec["ylabel"], color=text_color)
+    setp(ax.get_xticklabels(), color=text_color)
+    setp(ax.get_yticklabels(), color=text_color)
+
+
+def _render_hist(spec):
+    fig, ax = _new_figure(spec)
+    edges = spec["bin_edges"]
+    ax.hist(edges[:-1], bins=edges, weights=spec["counts"], color=spec.get("color"))
+    _style_axes(ax, spec)
+    return fig
+
+
+def _render_barh(spec):
+    fig, ax = _new_figure(spec)
+    y = range(len(spec["labels"]))
+
+    ax.barh(y, spec["values"], color=spec.get("color"))
+    ax.set_yticks(y)
+    ax.set_yticklabels(spec["labels"])
+    ax.invert_yaxis()
+    _style_axes(ax, spec)
+
+    fig.tight_layout()
+    return fig
+
+
+def _render_scatter(spec):
+    fig, ax = _new_figure(spec)
+    xs, ys, labels = spec["x"], spec["y"], spec.get("labels") or []
+
+    ax.scatter(xs, ys, color=spec.get("color"))
+    _style_axes(ax, spec)
+
+    if labels and not spec.get("thumb"):
+        for i in declutter_labels(xs, ys):
+            ax.annotate(
+                labels[i],
+                (xs[i], ys[i]),
+                textcoords="offset points",
+                xytext=(3, 3),
+                fontsize=7,
+            )
+
+    fig.tight_layout()
+    return fig
+
+
+RENDERERS = {
+    "hist": _render_hist,
+    "barh": _render_barh,
+    "scatter": _render_scatter,
+}
+
+
+# Render a plain chart spec (dict of lists/strings/colors) to image bytes in
+# spec["format"] (png, webp or svg). Thumbnails skip the extra layout pass of
+# bbox_inches="tight".
+def draw_spec(spec):
+    fig = RENDERERS[spec["kind"]](spec)
+    fmt = spec.get("format", "png")
+
+    # No creation date in SVG metadata, so repeated renders are byte-identical
+    metadata = {"Date": None} if fmt == "svg" else None
+
+    buf = BytesIO()
+    fig.savefig(
+        buf,
+        format=fmt,
+        bbox_inches=None if spec.get("thumb") else "tight",
+        metadata=metadata,
+    )
+    return buf.getvalue()
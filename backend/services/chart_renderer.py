@@ -0,0 +1,84 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from flask import current_app
+
+
+# Raised when the render queue is full; the API answers 503 so clients back off
+class RenderBusy(Exception):
+    pass
+
+
+# Raised when a render does not finish within CHART_RENDER_TIMEOUT seconds
+class RenderTimeout(Exception):
+    pass
+
+
+# Render a plain chart spec to image bytes. Picklable in and out, so it can run
+# in a pool worker. Matplotlib is imported on first use so processes that never
+# draw (JSON API workers, seed scripts, migrations) don't load it.
+def render_spec(spec):
+    from services.chart_drawing import draw_spec
+    return draw_spec(spec)
+
+
+################### Worker pool (used from the request threads)
+
+_pool_lock = threading.Lock()
+_pool_state = {"pool": None, "slots": None, "pid": None}
+
+
+def _get_pool(workers, max_queue):
+    with _pool_lock:
+        # A forked server worker must not reuse its parent's pool
+        if _pool_state["pool"] is None or _pool_state["pid"] != os.getpid():
+            _pool_state["pool"] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+            )
+            _pool_state["slots"] = threading.BoundedSemaphore(max_queue)
+            _pool_state["pid"] = os.getpid()
+        return _pool_state["pool"], _pool_state["slots"]
+
+
+def _reset_pool(pool):
+    with _pool_lock:
+        if _pool_state["pool"] is pool:
+            _pool_state["pool"] = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Render a chart spec off the request thread.
+# CHART_RENDER_WORKERS=0 renders inline (useful for scripts and debugging).
+# At most CHART_RENDER_MAX_QUEUE renders may be queued or running per server
+# process; beyond that RenderBusy is raised immediately instead of queueing.
+def render_chart(spec):
+    config = current_app.config
+    workers = config.get("CHART_RENDER_WORKERS", 2)
+    if workers <= 0:
+        return render_spec(spec)
+
+    pool, slots = _get_pool(workers, config.get("CHART_RENDER_MAX_QUEUE", workers * 4))
+    if not slots.acquire(blocking=False):
+        raise RenderBusy()
+
+    try:
+        future = pool.submit(render_spec, spec)
+    except (BrokenProcessPool, RuntimeError):
+        slots.release()
+        _reset_pool(pool)
+        raise RenderBusy()
+
+    # The slot is held until the render really finishes, even if we stop waiting
+    future.add_done_callback(lambda f: slots.release())
+
+    try:
+        return future.result(timeout=config.get("CHART_RENDER_TIMEOUT", 10))
+    except FutureTimeout:
+        raise RenderTimeout()
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        raise RenderBusy()
@@ -0,0 +1,83 @@
+from datetime import date, datetime
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from extensions import db
+from models import ComplaintDailyStats
+
+# Trend buckets served by /api/complaints/stats; week and month are rolled up
+# from the daily rows at query time.
+GRANULARITIES = ("day", "week", "month")
+GROUP_BY = {
+    "state": ComplaintDailyStats.state_id,
+    "district": ComplaintDailyStats.district_id,
+    "hospital": ComplaintDailyStats.hospital_id,
+}
+
+
+# Count one new complaint in its day bucket. Runs in the caller's transaction,
+# so the rollup commits (or rolls back) together with the complaint.
+def record_complaint(complaint):
+    created_at = complaint.created_at or datetime.utcnow()
+    now = datetime.utcnow()
+
+    stmt = insert(ComplaintDailyStats).values(
+        day=created_at.date(),
+        state_id=complaint.state_id or 0,
+        district_id=complaint.district_id or 0,
+        hospital_id=complaint.hospital_id or 0,
+        num_complaints=1,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day", "state_id", "district_id", "hospital_id"],
+        set_={"num_complaints": ComplaintDailyStats.num_complaints + 1, "updated_at": now},
+    )
+    db.session.execute(stmt)
+
+
+# Complaint counts per period, optionally filtered and split by state, district
+# or hospital. Returns [(period_start: date, group_id or None, count)] ordered
+# by period then group.
+def complaint_series(granularity="day", start=None, end=None,
+                     state_id=None, district_id=None, hospital_id=None, group_by=None):
+    if granularity == "day":
+        period = ComplaintDailyStats.day
+    else:
+        period = func.date_trunc(granularity, ComplaintDailyStats.day).cast(db.Date)
+    period = period.label("period")
+
+    columns = [period]
+    group_col = GROUP_BY.get(group_by)
+    if group_col is not None:
+        columns.append(group_col.label("group_id"))
+    columns.append(func.sum(ComplaintDailyStats.num_complaints).label("count"))
+
+    query = db.session.query(*columns)
+
+    if start is not None:
+        query = query.filter(ComplaintDailyStats.day >= start)
+    if end is not None:
+        query = query.filter(ComplaintDailyStats.day <= end)
+    if state_id is not None:
+        query = query.filter(ComplaintDailyStats.state_id == state_id)
+    if district_id is not None:
+        query = query.filter(ComplaintDailyStats.district_id == district_id)
+    if hospital_id is not None:
+        query = query.filter(ComplaintDailyStats.hospital_id == hospital_id)
+
+    group_cols = [period] if group_col is None else [period, group_col]
+    rows = query.group_by(*group_cols).order_by(*group_cols).all()
+
+    return [
+        (r.period, (r.group_id or None) if group_col is not None else None, int(r.count))
+        for r in rows
+    ]
+
+
+# Parse a YYYY-MM-DD query parameter; None if absent, ValueError if malformed
+def parse_day(value):
+    if not value:
+        return None
+    return date.fromisoformat(value)
@@ -0,0 +1,232 @@
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from extensions import db
+from models import State, District, Category, Hospital, hospital_category
+from data_version import get_data_version
+
+# Tables each half of the matrix is built from. The district axis (names,
+# population) and the hospital/category counts are rebuilt independently, so a
+# district reload does not re-read the 6k+ association rows and vice versa.
+DISTRICT_TABLES = ("state", "district")
+LINK_TABLES = ("hospital", "hospital_category", "category")
+
+
+# Position of each value in an (unsorted) id axis, and whether it was found
+def axis_positions(axis, values):
+    if len(axis) == 0:
+        return np.zeros(len(values), dtype=int), np.zeros(len(values), dtype=bool)
+
+    order = np.argsort(axis, kind="stable")
+    pos = np.minimum(np.searchsorted(axis, values, sorter=order), len(axis) - 1)
+    idx = order[pos]
+    return idx, axis[idx] == values
+
+
+# District x category coverage as two sparse matrices: number of hospitals
+# offering the category in the district, and the beds of those hospitals.
+# Rows follow self.district_ids, columns self.category_ids. A matrix is not
+# changed once built; refreshed() returns a new one.
+class CoverageMatrix:
+    def __init__(self):
+        self.district_version = None
+        self.link_version = None
+
+        self.district_ids = np.zeros(0, dtype=int)
+        self.districts = []
+        self.state_ids = np.zeros(0, dtype=int)
+        self.population = np.zeros(0, dtype=float)
+
+        self.category_ids = np.zeros(0, dtype=int)
+        self.categories = []
+
+        self.hospitals = sparse.csr_matrix((0, 0), dtype=np.int64)
+        self.beds = sparse.csr_matrix((0, 0), dtype=np.int64)
+
+        self._links = None
+
+    # All districts with their state, ordered by state then district name
+    def load_districts(self):
+        rows = (
+            db.session.query(
+                District.district_id,
+                District.district_name,
+                District.state_id,
+                State.state_name,
+                District.total_persons,
+            )
+            .join(State, State.state_id == District.state_id)
+            .order_by(State.state_name, District.district_name)
+            .all()
+        )
+        self.district_ids = np.array([r.district_id for r in rows], dtype=int)
+        self.state_ids = np.array([r.state_id for r in rows], dtype=int)
+        self.population = np.array([r.total_persons or 0 for r in rows], dtype=float)
+        self.districts = [
+            {
+                "district_id": r.district_id,
+                "district_name": r.district_name,
+                "state_id": r.state_id,
+                "state_name": r.state_name,
+                "total_persons": r.total_persons,
+            }
+            for r in rows
+        ]
+
+    # Categories and one (district_id, category_id, beds) triple per
+    # hospital/category link, as parallel arrays
+    def load_links(self):
+        categories = Category.query.order_by(Category.category_id).all()
+        self.category_ids = np.array([c.category_id for c in categories], dtype=int)
+        self.categories = [c.to_dict() for c in categories]
+
+        rows = (
+            db.session.query(
+                Hospital.district_id,
+                hospital_category.c.category_id,
+                Hospital.total_beds,
+            )
+            .join(
+                hospital_category,
+                (hospital_category.c.hospital_id == Hospital.hospital_id)
+                & (hospital_category.c.state_id == Hospital.state_id),
+            )
+            .filter(Hospital.district_id.isnot(None))
+            .all()
+        )
+        self._links = (
+            np.array([r[0] for r in rows], dtype=int),
+            np.array([r[1] for r in rows], dtype=int),
+            np.array([r[2] or 0 for r in rows], dtype=np.int64),
+        )
+
+    # Scatter the links into the current district/category axes; duplicate
+    # (district, category) entries are summed by the COO -> CSR conversion.
+    # Links to districts or categories missing from the axes are dropped.
+    def assemble(self):
+        district_ids, category_ids, beds = self._links
+        shape = (len(self.district_ids), len(self.category_ids))
+
+        row, row_found = axis_positions(self.district_ids, district_ids)
+        col, col_found = axis_positions(self.category_ids, category_ids)
+        known = row_found & col_found
+
+        row, col, beds = row[known], col[known], beds[known]
+        self.hospitals = sparse.coo_matrix(
+            (np.ones(len(row), dtype=np.int64), (row, col)), shape=shape
+        ).tocsr()
+        self.beds = sparse.coo_matrix((beds, (row, col)), shape=shape).tocsr()
+
+    def is_current(self):
+        return (
+            self.district_version == get_data_version(*DISTRICT_TABLES)
+            and self.link_version == get_data_version(*LINK_TABLES)
+        )
+
+    # This matrix if it is current, else a new one with the stale half
+    # reloaded and the other half carried over from this one
+    def refreshed(self):
+        district_version = get_data_version(*DISTRICT_TABLES)
+        link_version = get_data_version(*LINK_TABLES)
+        if district_version == self.district_version and link_version == self.link_version:
+            return self
+
+        matrix = CoverageMatrix()
+        if district_version == self.district_version:
+            matrix.district_ids, matrix.districts = self.district_ids, self.districts
+            matrix.state_ids, matrix.population = self.state_ids, self.population
+        else:
+            matrix.load_districts()
+        if link_version == self.link_version:
+            matrix.category_ids, matrix.categories = self.category_ids, self.categories
+            matrix._links = self._links
+        else:
+            matrix.load_links()
+
+        matrix.district_version = district_version
+        matrix.link_version = link_version
+        matrix.assemble()
+        return matrix
+
+    @property
+    def version(self):
+        return f"{self.district_version}|{self.link_version}"
+
+    # Row indices of the districts of one state, or all districts
+    def district_rows(self, state_id=None):
+        if state_id is None:
+            return np.arange(len(self.district_ids))
+        return np.flatnonzero(self.state_ids == state_id)
+
+    # Column index of a category, or None if unknown
+    def category_col(self, category_id):
+        col, found = axis_positions(self.category_ids, np.array([category_id]))
+        return int(col[0]) if found[0] else None
+
+    # Per-district hospitals, beds and per-capita coverage of one category.
+    # per: population unit for the per-capita values (e.g. 100000).
+    def category_coverage(self, category_id, state_id=None, per=100000):
+        col = self.category_col(category_id)
+        rows = self.district_rows(state_id)
+
+        hospitals = self.hospitals[:, col].toarray().ravel()[rows]
+        beds = self.beds[:, col].toarray().ravel()[rows]
+        population = self.population[rows]
+
+        has_population = population > 0
+        safe = np.where(has_population, population, 1.0)
+        hospitals_per = np.where(has_population, hospitals * per / safe, np.nan)
+        beds_per = np.where(has_population, beds * per / safe, np.nan)
+
+        return [
+            {
+                **self.districts[i],
+                "hospitals": int(h),
+                "beds": int(b),
+                "hospitals_per_capita": None if np.isnan(hp) else float(hp),
+                "beds_per_capita": None if np.isnan(bp) else float(bp),
+            }
+            for i, h, b, hp, bp in zip(rows, hospitals, beds, hospitals_per, beds_per)
+        ]
+
+    # Per-category totals over the districts of one state (or all districts):
+    # hospitals, beds, districts with at least one facility and without any.
+    def category_summary(self, state_id=None):
+        rows = self.district_rows(state_id)
+        hospitals = self.hospitals[rows]
+        beds = self.beds[rows]
+
+        total_hospitals = np.asarray(hospitals.sum(axis=0)).ravel()
+        total_beds = np.asarray(beds.sum(axis=0)).ravel()
+        covered = np.diff(hospitals.tocsc().indptr)
+
+        return [
+            {
+                **category,
+                "hospitals": int(total_hospitals[j]),
+                "beds": int(total_beds[j]),
+                "districts_covered": int(covered[j]),
+                "districts_without": int(len(rows) - covered[j]),
+            }
+            for j, category in enumerate(self.categories)
+        ]
+
+
+_coverage_lock = threading.Lock()
+_coverage_state = {"matrix": CoverageMatrix()}
+
+
+# The coverage matrix for the current data, rebuilt on first use and after
+# districts, hospitals or category links are reloaded. A rebuild swaps in a
+# new matrix, so callers keep reading a consistent one.
+def get_coverage_matrix():
+    matrix = _coverage_state["matrix"]
+    if matrix.is_current():
+        return matrix
+
+    with _coverage_lock:
+        matrix = _coverage_state["matrix"].refreshed()
+        _coverage_state["matrix"] = matrix
+        return matrix
@@ -0,0 +1,121 @@
+from sqlalchemy import text
+
+from extensions import db
+from data_version import bump_data_version
+
+# Rebuilds district_stats from district + hospital in one statement. Every
+# district gets a row, with zero counts when it has no hospitals.
+REFRESH_DISTRICT_SQL = text("""
+    INSERT INTO district_stats (
+        district_id, state_id, district_name,
+        num_hospitals, total_beds, hospitals_by_type,
+        total_persons, total_males, total_females, children_persons,
+        beds_per_10k, hospitals_per_100k, refreshed_at
+    )
+    SELECT
+        d.district_id,
+        d.state_id,
+        d.district_name,
+        COALESCE(h.num_hospitals, 0),
+        COALESCE(h.total_beds, 0),
+        COALESCE(t.hospitals_by_type, '{}'::jsonb),
+        d.total_persons,
+        d.total_males,
+        d.total_females,
+        d.children_persons,
+        CASE WHEN d.total_persons > 0
+             THEN COALESCE(h.total_beds, 0) * 10000.0 / d.total_persons ELSE 0 END,
+        CASE WHEN d.total_persons > 0
+             THEN COALESCE(h.num_hospitals, 0) * 100000.0 / d.total_persons ELSE 0 END,
+        now() AT TIME ZONE 'utc'
+    FROM district d
+    LEFT JOIN (
+        SELECT district_id,
+               COUNT(*) AS num_hospitals,
+               SUM(COALESCE(total_beds, 0)) AS total_beds
+        FROM hospital
+        GROUP BY district_id
+    ) h ON h.district_id = d.district_id
+    LEFT JOIN (
+        SELECT district_id, jsonb_object_agg(hospital_type, num_hospitals) AS hospitals_by_type
+        FROM (
+            SELECT district_id, COALESCE(hospital_type, 'Unknown') AS hospital_type, COUNT(*) AS num_hospitals
+            FROM hospital
+            GROUP BY 1, 2
+        ) by_type
+        GROUP BY district_id
+    ) t ON t.district_id = d.district_id
+""")
+
+
+# Rebuilds state_stats from state + district + hospital. Hospital counts come
+# from the hospital table by state_id, so hospitals without a district are
+# still counted; population is the sum over the state's districts.
+REFRESH_STATE_SQL = text("""
+    INSERT INTO state_stats (
+        state_id, state_name,
+        num_districts, num_hospitals, total_beds, hospitals_by_type,
+        total_persons, total_males, total_females, children_persons,
+        beds_per_10k, hospitals_per_100k, refreshed_at
+    )
+    SELECT
+        s.state_id,
+        s.state_name,
+        COALESCE(d.num_districts, 0),
+        COALESCE(h.num_hospitals, 0),
+        COALESCE(h.total_beds, 0),
+        COALESCE(t.hospitals_by_type, '{}'::jsonb),
+        d.total_persons,
+        d.total_males,
+        d.total_females,
+        d.children_persons,
+        CASE WHEN d.total_persons > 0
+             THEN COALESCE(h.total_beds, 0) * 10000.0 / d.total_persons ELSE 0 END,
+        CASE WHEN d.total_persons > 0
+             THEN COALESCE(h.num_hospitals, 0) * 100000.0 / d.total_persons ELSE 0 END,
+        now() AT TIME ZONE 'utc'
+    FROM state s
+    LEFT JOIN (
+        SELECT state_id,
+               COUNT(*) AS num_districts,
+               SUM(total_persons) AS total_persons,
+               SUM(total_males) AS total_males,
+               SUM(total_females) AS total_females,
+               SUM(children_persons) AS children_persons
+        FROM district
+        GROUP BY state_id
+    ) d ON d.state_id = s.state_id
+    LEFT JOIN (
+        SELECT state_id,
+               COUNT(*) AS num_hospitals,
+               SUM(COALESCE(total_beds, 0)) AS total_beds
+        FROM hospital
+        GROUP BY state_id
+    ) h ON h.state_id = s.state_id
+    LEFT JOIN (
+        SELECT state_id, jsonb_object_agg(hospital_type, num_hospitals) AS hospitals_by_type
+        FROM (
+            SELECT state_id, COALESCE(hospital_type, 'Unknown') AS hospital_type, COUNT(*) AS num_hospitals
+            FROM hospital
+            GROUP BY 1, 2
+        ) by_type
+        GROUP BY state_id
+    ) t ON t.state_id = s.state_id
+""")
+
+
+# Recompute district_stats. Runs in the caller's transaction (the caller
+# commits), so readers see either the old or the new table, never a mix.
+def refresh_district_stats():
+    db.session.flush()
+    db.session.execute(text("DELETE FROM district_stats"))
+    db.session.execute(REFRESH_DISTRICT_SQL)
+    bump_data_version("district_stats")
+
+
+# Recompute state_stats, same transaction rules as refresh_district_stats()
+def refresh_state_stats():
+    db.session.flush()
+    db.session.execute(text("DELETE FROM state_stats"))
+    db.session.execute(REFRESH_STATE_SQL)
+    bump_data_version("state_stats")
@@ -0,0 +1,41 @@
+from datetime import date, datetime
+
+from extensions import db
+
+
+# Requested fields from a comma separated fields= parameter, in request order
+# and without duplicates. None when the parameter is absent; ValueError for
+# fields outside allowed.
+def parse_fields(value, allowed):
+    if value is None:
+        return None
+
+    fields = list(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    if not fields:
+        raise ValueError("fields must name at least one field")
+
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return fields
+
+
+# Query selecting only the given columns of model (plus extra columns needed
+# for filtering or paging). Returns plain rows; no ORM objects are built.
+def fields_query(model, fields, extra=()):
+    names = list(dict.fromkeys([*fields, *extra]))
+    return db.session.query(*[getattr(model, name) for name in names])
+
+
+# Dict of the requested fields of a result row, dates as ISO strings like to_dict()
+def row_dict(row, fields):
+    out = {}
+    for field in fields:
+        value = getattr(row, field)
+        out[field] = value.isoformat() if isinstance(value, (date, datetime)) else value
+    return out
+
+
+# The requested fields of an already serialized dict
+def project(item, fields):
+    return {field: item.get(field) for field in fields}
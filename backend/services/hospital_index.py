@@ -0,0 +1,83 @@
+import threading
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from models import Hospital
+from data_version import get_data_version
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+# Lat/lon in degrees -> points on the unit sphere. Euclidean (chord) distance
+# between these points is monotonic in great-circle distance, so a k-d tree
+# over them answers haversine nearest-neighbour and radius queries exactly.
+def to_unit_xyz(lat, lon):
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_km(chord):
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2.0, 0.0, 1.0))
+
+
+def km_to_chord(km):
+    return 2.0 * np.sin(np.asarray(km) / (2.0 * EARTH_RADIUS_KM))
+
+
+# In-memory k-d tree over every hospital with coordinates, plus the
+# serialized rows so queries are answered without touching the database.
+class HospitalIndex:
+    def __init__(self, hospitals):
+        self.rows = [h.to_dict() for h in hospitals]
+        self.lat = np.array([h.latitude for h in hospitals], dtype=float)
+        self.lon = np.array([h.longitude for h in hospitals], dtype=float)
+        self.tree = cKDTree(to_unit_xyz(self.lat, self.lon)) if hospitals else None
+
+    def __len__(self):
+        return len(self.rows)
+
+    # Up to k nearest hospitals to (lat, lon), optionally within radius_km.
+    # Returns [(row, distance_km)] sorted by distance.
+    def nearby(self, lat, lon, k=10, radius_km=None):
+        if self.tree is None:
+            return []
+
+        k = min(k, len(self.rows))
+        point = to_unit_xyz([lat], [lon])[0]
+        upper = km_to_chord(radius_km) if radius_km is not None else np.inf
+
+        chords, idx = self.tree.query(point, k=k, distance_upper_bound=upper)
+        chords, idx = np.atleast_1d(chords), np.atleast_1d(idx)
+        found = np.isfinite(chords)
+
+        return [
+            (self.rows[i], float(d))
+            for i, d in zip(idx[found], chord_to_km(chords[found]))
+        ]
+
+
+_index_lock = threading.Lock()
+_index_state = {"version": None, "index": None}
+
+
+# The index for the current hospital data, built on first use and rebuilt
+# after the hospital table is reloaded
+def get_hospital_index():
+    version = get_data_version("hospital")
+    if _index_state["version"] == version:
+        return _index_state["index"]
+
+    with _index_lock:
+        if _index_state["version"] != version:
+            hospitals = (
+                Hospital.query
+                .filter(Hospital.latitude.isnot(None), Hospital.longitude.isnot(None))
+                .order_by(Hospital.state_id, Hospital.hospital_id)
+                .all()
+            )
+            _index_state["index"] = HospitalIndex(hospitals)
+            _index_state["version"] = version
+        return _index_state["index"]
@@ -0,0 +1,124 @@
+import re
+import threading
+
+import numpy as np
+
+from models import Hospital
+from data_version import get_data_version
+
+# Query trigrams a name must contain to be returned, as a share of the query's
+WORD_MATCH_THRESHOLD = 0.3
+# Address matches count for less than name matches
+ADDRESS_WEIGHT = 0.5
+
+_WORD_RE = re.compile(r"[0-9a-z]+")
+
+
+# Trigrams of a string the way pg_trgm builds them: lowercased alphanumeric
+# words, each padded with two spaces in front and one behind.
+def trigrams(text):
+    grams = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# Inverted trigram index over one text field: trigram -> array of row ids,
+# plus the number of trigrams of each row.
+class TrigramField:
+    def __init__(self, texts):
+        postings = {}
+        self.sizes = np.zeros(len(texts), dtype=np.int32)
+        for i, text in enumerate(texts):
+            grams = trigrams(text)
+            self.sizes[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self.postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    # Number of the query's trigrams each row shares with it
+    def shared(self, grams, count):
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        if not lists:
+            return np.zeros(count, dtype=np.int32)
+        return np.bincount(np.concatenate(lists), minlength=count)
+
+
+# In-memory trigram index over hospital names and addresses for typo-tolerant
+# autocomplete. A hospital's score is how much of the query it covers (like
+# pg_trgm's word_similarity), tie-broken by whole-string similarity so closer
+# and shorter names rank first.
+class HospitalSearchIndex:
+    def __init__(self, hospitals):
+        self.rows = [
+            {
+                "hospital_id": h.hospital_id,
+                "state_id": h.state_id,
+                "district_id": h.district_id,
+                "hospital_name": h.hospital_name,
+                "address": h.address,
+                "pincode": h.pincode,
+                "hospital_type": h.hospital_type,
+            }
+            for h in hospitals
+        ]
+        self.state_ids = np.array([h.state_id for h in hospitals], dtype=np.int64)
+        self.district_ids = np.array([h.district_id or 0 for h in hospitals], dtype=np.int64)
+        self.names = TrigramField([h.hospital_name for h in hospitals])
+        self.addresses = TrigramField([h.address for h in hospitals])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _scores(self, field, grams):
+        shared = field.shared(grams, len(self.rows))
+        coverage = shared / len(grams)
+        similarity = shared / np.maximum(field.sizes + len(grams) - shared, 1)
+        return coverage, similarity
+
+    # Top k hospitals matching q, optionally within a state and/or district.
+    # Returns [(row, score)] best first.
+    def search(self, q, k=10, state_id=None, district_id=None):
+        grams = trigrams(q)
+        if not grams or not self.rows:
+            return []
+
+        name_cov, name_sim = self._scores(self.names, grams)
+        addr_cov, addr_sim = self._scores(self.addresses, grams)
+
+        coverage = np.maximum(name_cov, ADDRESS_WEIGHT * addr_cov)
+        score = coverage + 0.1 * np.maximum(name_sim, ADDRESS_WEIGHT * addr_sim)
+
+        mask = coverage >= WORD_MATCH_THRESHOLD
+        if state_id is not None:
+            mask &= self.state_ids == state_id
+        if district_id is not None:
+            mask &= self.district_ids == district_id
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > k:
+            top = np.argpartition(-score[candidates], k - 1)[:k]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-score[candidates], kind="stable")]
+
+        return [(self.rows[i], float(score[i])) for i in candidates]
+
+
+_index_lock = threading.Lock()
+_index_state = {"version": None, "index": None}
+
+
+# The search index for the current hospital data, built on first use and
+# rebuilt after the hospital table is reloaded
+def get_hospital_search_index():
+    version = get_data_version("hospital")
+    if _index_state["version"] == version:
+        return _index_state["index"]
+
+    with _index_lock:
+        if _index_state["version"] != version:
+            hospitals = Hospital.query.order_by(Hospital.state_id, Hospital.hospital_id).all()
+            _index_state["index"] = HospitalSearchIndex(hospitals)
+            _index_state["version"] = version
+        return _index_state["index"]
@@ -0,0 +1,279 @@
+import json
+import os
+import re
+import struct
+import threading
+import zlib
+from hashlib import sha256
+
+from flask import current_app
+
+from extensions import db
+from models import State, District, Hospital
+from data_version import get_data_version
+from services.output_dir import check_output_dir, manifest_files, prune_output_dir
+
+# Tables the grouped state -> district -> hospital tree is built from
+SNAPSHOT_TABLES = ("state", "district", "hospital")
+MANIFEST_NAME = "manifest.json"
+# Snapshots are raw deflate ending in a sync flush, so they can be spliced into
+# one gzip stream; manifests written in another format are ignored
+SNAPSHOT_FORMAT = "deflate-sync"
+# Names of the files write_snapshots() writes (and wrote in the gzip format)
+SNAPSHOT_FILE_RE = re.compile(r"state-\d+\.[0-9a-f]{16}\.(deflate|json\.gz)")
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+# The grouped tree for the given states: each state dict gets its districts
+# (all of them, even without hospitals) and each district its hospitals, both
+# ordered by name. district_id restricts the tree to one district.
+def build_grouped_states(states, district_id=None):
+    state_ids = [s.state_id for s in states]
+
+    district_query = District.query.filter(District.state_id.in_(state_ids))
+    if district_id:
+        district_query = district_query.filter(District.district_id == district_id)
+    districts = district_query.order_by(District.district_name).all()
+
+    hospital_query = Hospital.query.filter(Hospital.state_id.in_(state_ids))
+    if district_id:
+        hospital_query = hospital_query.filter(Hospital.district_id == district_id)
+    hospitals = hospital_query.order_by(Hospital.hospital_name).all()
+
+    state_map = {s.state_id: {**s.to_dict(), "districts": {}} for s in states}
+
+    for d in districts:
+        state_map[d.state_id]["districts"][d.district_id] = {
+            **d.to_dict(),
+            "hospitals": [],
+            "count": 0,
+        }
+
+    for h in hospitals:
+        entry = state_map[h.state_id]["districts"].get(h.district_id)
+        if entry is not None:
+            entry["hospitals"].append(h.to_dict())
+            entry["count"] += 1
+
+    result = []
+    for s in state_map.values():
+        s["districts"] = list(s["districts"].values())
+        s["count"] = len(s["districts"])
+        result.append(s)
+    return result
+
+
+# Raw deflate of data ending in a sync flush: byte aligned and without a final
+# block, so pieces compressed separately can be concatenated into one stream
+def deflate_piece(data, level=9):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+# CRC-32 of a + b from crc32(a), crc32(b) and len(b), as zlib's crc32_combine()
+# (not exposed by Python's zlib module)
+def _gf2_times(matrix, vector):
+    total, i = 0, 0
+    while vector:
+        if vector & 1:
+            total ^= matrix[i]
+        vector >>= 1
+        i += 1
+    return total
+
+
+def _gf2_square(matrix):
+    return [_gf2_times(matrix, row) for row in matrix]
+
+
+def crc32_combine(crc1, crc2, len2):
+    if len2 <= 0:
+        return crc1
+
+    # Operator for one zero bit, then two and four
+    odd = [0xEDB88320] + [1 << n for n in range(31)]
+    even = _gf2_square(odd)
+    odd = _gf2_square(even)
+
+    # Apply len2 zero bytes to crc1, squaring the operator for each bit of len2
+    while True:
+        even = _gf2_square(odd)
+        if len2 & 1:
+            crc1 = _gf2_times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        odd = _gf2_square(even)
+        if len2 & 1:
+            crc1 = _gf2_times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+    return crc1 ^ crc2
+
+
+# Serialize one state's tree the way jsonify does (sorted keys, compact) and
+# compress it with deflate_piece(). crc32 and bytes let stream_snapshots()
+# write the gzip trailer without inflating it again.
+def encode_snapshot(tree):
+    raw = current_app.json.dumps(tree, separators=(",", ":")).encode()
+    return {
+        "state_id": tree["state_id"],
+        "digest": sha256(raw).hexdigest()[:16],
+        "bytes": len(raw),
+        "crc32": zlib.crc32(raw),
+        "deflate": deflate_piece(raw),
+    }
+
+
+# Compressed per-state snapshots for the current data version. Looked up in
+# memory, then in the manifest written by seed/08_build_hospital_snapshots.py,
+# and built from the database as a last resort.
+class SnapshotStore:
+    def __init__(self, out_dir, version):
+        self.out_dir = out_dir
+        self.version = version
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("data_version") != self.version or manifest.get("format") != SNAPSHOT_FORMAT:
+            return {}
+        return {int(k): v for k, v in manifest.get("states", {}).items()}
+
+    # Snapshot entry for a state: digest, bytes, crc32, and either deflate (in
+    # memory) or path (file written by the seed script)
+    def get(self, state_id):
+        entry = self._entries.get(state_id)
+        if entry is not None:
+            return entry
+
+        stored = self._manifest.get(state_id)
+        if stored is not None:
+            path = os.path.join(self.out_dir, stored["file"])
+            if os.path.exists(path):
+                entry = {**stored, "path": path}
+
+        if entry is None:
+            state = db.session.get(State, state_id)
+            entry = encode_snapshot(build_grouped_states([state])[0])
+
+        with self._lock:
+            return self._entries.setdefault(state_id, entry)
+
+
+_store_lock = threading.Lock()
+
+
+# One store per app, replaced when the grouped data changes
+def get_snapshot_store():
+    version = get_data_version(*SNAPSHOT_TABLES)
+    store = current_app.extensions.get("hospital_snapshots")
+    if store is not None and store.version == version:
+        return store
+
+    with _store_lock:
+        store = current_app.extensions.get("hospital_snapshots")
+        if store is None or store.version != version:
+            store = SnapshotStore(current_app.config["HOSPITAL_SNAPSHOT_DIR"], version)
+            current_app.extensions["hospital_snapshots"] = store
+    return store
+
+
+# Compressed chunks of one snapshot, read from disk in pieces if stored there
+def _snapshot_chunks(entry):
+    if "deflate" in entry:
+        yield entry["deflate"]
+        return
+
+    with open(entry["path"], "rb") as f:
+        while True:
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+# gzip header with no name and mtime 0, and the empty final deflate block
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\xff"
+DEFLATE_END = b"\x03\x00"
+
+
+# Stream {"count": n, "data": [state, ...]} from the snapshots, one state at a
+# time. With compressed=True the body is a single gzip stream: the snapshots'
+# deflate data is spliced in unchanged between separately deflated envelope
+# pieces, and the trailer's CRC is combined from the snapshots' stored CRCs.
+# Otherwise each snapshot is inflated as it is sent.
+def stream_snapshots(entries, compressed):
+    crc, size = 0, 0
+
+    def piece(data):
+        nonlocal crc, size
+        if not compressed:
+            return data
+        crc = zlib.crc32(data, crc)
+        size += len(data)
+        return deflate_piece(data)
+
+    if compressed:
+        yield GZIP_HEADER
+    yield piece(b'{"count":%d,"data":[' % len(entries))
+    for i, entry in enumerate(entries):
+        if i:
+            yield piece(b",")
+        if compressed:
+            yield from _snapshot_chunks(entry)
+            crc = crc32_combine(crc, entry["crc32"], entry["bytes"])
+            size += entry["bytes"]
+        else:
+            inflater = zlib.decompressobj(wbits=-zlib.MAX_WBITS)
+            for chunk in _snapshot_chunks(entry):
+                yield inflater.decompress(chunk)
+            yield inflater.flush()
+    yield piece(b"]}\n")
+    if compressed:
+        yield DEFLATE_END + struct.pack("<II", crc, size & 0xFFFFFFFF)
+
+
+# Write every state's snapshot as a content-hashed .deflate file plus a
+# manifest, replacing the manifest atomically and removing snapshot files it no
+# longer references. Raises ValueError for a non-empty directory without a
+# manifest. Returns (manifest states, number of files removed).
+def write_snapshots(out_dir, states, data_version):
+    check_output_dir(out_dir, MANIFEST_NAME)
+    os.makedirs(out_dir, exist_ok=True)
+    previous = manifest_files(os.path.join(out_dir, MANIFEST_NAME), "states")
+
+    manifest = {}
+    for state in states:
+        entry = encode_snapshot(build_grouped_states([state])[0])
+        filename = f"state-{state.state_id}.{entry['digest']}.deflate"
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(entry["deflate"])
+        manifest[str(state.state_id)] = {
+            "state_id": state.state_id,
+            "digest": entry["digest"],
+            "bytes": entry["bytes"],
+            "crc32": entry["crc32"],
+            "file": filename,
+        }
+
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"data_version": data_version, "format": SNAPSHOT_FORMAT, "states": manifest}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+    keep = {entry["file"] for entry in manifest.values()} | {MANIFEST_NAME}
+    removed = prune_output_dir(out_dir, keep, previous, SNAPSHOT_FILE_RE)
+
+    return manifest, removed
@@ -0,0 +1,219 @@
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timezone
+
+from flask import current_app
+from sqlalchemy import func
+
+from extensions import db
+from models import Hospital, DistrictStats, ComplaintDailyStats
+from data_version import get_data_version
+
+HOTSPOT_LEVELS = ("hospital", "district")
+
+# Capacity used to normalize scores; a reload of either rebuilds the index
+CAPACITY_TABLES = ("hospital", "district_stats")
+
+
+# Complaint hotspots per state, ranked by time-decayed complaint rate:
+#   hospital: decayed complaints per 100 beds (beds floored at min_beds)
+#   district: decayed complaints per 100k population
+#
+# Scores use forward decay: a complaint at time t adds exp(rate * (t - epoch))
+# to its hospital and district, and the current score is that sum times
+# exp(-rate * (now - epoch)). The factor is shared by every entry, so a new
+# complaint is an O(1) update and rankings only change when complaints arrive.
+class HotspotIndex:
+    def __init__(self, half_life_days=30, min_beds=10):
+        self.rate = math.log(2) / (half_life_days * 86400.0)
+        self.min_beds = max(1, min_beds)
+        self.epoch = time.time()
+
+        self.hospitals = {}
+        self.districts = {}
+        # {level: {state_id: {key: [decayed weight sum, complaint count]}}}
+        self.scores = {level: defaultdict(dict) for level in HOTSPOT_LEVELS}
+        # {(level, state_id): [key, ...] sorted by rate, highest first}
+        self._rankings = {}
+
+        self.capacity_version = None
+        self.synced_at = None
+        self._lock = threading.Lock()
+
+    # Hospital beds and district population, keyed like the scores
+    def load_capacity(self):
+        hospitals = db.session.query(
+            Hospital.state_id,
+            Hospital.hospital_id,
+            Hospital.hospital_name,
+            Hospital.district_id,
+            Hospital.total_beds,
+        ).all()
+        self.hospitals = {
+            (h.state_id, h.hospital_id): {
+                "state_id": h.state_id,
+                "hospital_id": h.hospital_id,
+                "hospital_name": h.hospital_name,
+                "district_id": h.district_id,
+                "total_beds": h.total_beds,
+            }
+            for h in hospitals
+        }
+
+        districts = db.session.query(
+            DistrictStats.district_id,
+            DistrictStats.state_id,
+            DistrictStats.district_name,
+            DistrictStats.total_persons,
+        ).all()
+        self.districts = {
+            d.district_id: {
+                "district_id": d.district_id,
+                "state_id": d.state_id,
+                "district_name": d.district_name,
+                "total_persons": d.total_persons,
+            }
+            for d in districts
+        }
+
+    # Rebuild all scores from the daily complaint rollup, each day's complaints
+    # weighted as if made at noon UTC
+    def load_scores(self):
+        rows = (
+            db.session.query(
+                ComplaintDailyStats.day,
+                ComplaintDailyStats.state_id,
+                ComplaintDailyStats.district_id,
+                ComplaintDailyStats.hospital_id,
+                func.sum(ComplaintDailyStats.num_complaints).label("count"),
+            )
+            .group_by(
+                ComplaintDailyStats.day,
+                ComplaintDailyStats.state_id,
+                ComplaintDailyStats.district_id,
+                ComplaintDailyStats.hospital_id,
+            )
+            .all()
+        )
+
+        scores = {level: defaultdict(dict) for level in HOTSPOT_LEVELS}
+        for r in rows:
+            noon = datetime.combine(r.day, dt_time(12), tzinfo=timezone.utc).timestamp()
+            self._add(scores, r.state_id, r.district_id, r.hospital_id, noon, int(r.count))
+
+        self.scores = scores
+        self._rankings = {}
+
+    def _add(self, scores, state_id, district_id, hospital_id, timestamp, count=1):
+        weight = count * math.exp(self.rate * (timestamp - self.epoch))
+        for level, key in (("hospital", hospital_id), ("district", district_id)):
+            if not state_id or not key:
+                continue
+            entry = scores[level][state_id].setdefault(key, [0.0, 0])
+            entry[0] += weight
+            entry[1] += count
+
+    # Count one new complaint without rescanning anything
+    def add_complaint(self, complaint):
+        created_at = complaint.created_at or datetime.utcnow()
+        timestamp = created_at.replace(tzinfo=timezone.utc).timestamp()
+
+        with self._lock:
+            self._add(self.scores, complaint.state_id, complaint.district_id, complaint.hospital_id, timestamp)
+            self._rankings.pop(("hospital", complaint.state_id), None)
+            self._rankings.pop(("district", complaint.state_id), None)
+            self._rankings.pop(("hospital", None), None)
+            self._rankings.pop(("district", None), None)
+
+    # Capacity an entry's score is divided by, or None if it can't be ranked
+    def _capacity(self, level, state_id, key):
+        if level == "hospital":
+            hospital = self.hospitals.get((state_id, key))
+            if hospital is None:
+                return None
+            return max(hospital["total_beds"] or 0, self.min_beds) / 100.0
+
+        district = self.districts.get(key)
+        if district is None or not district["total_persons"]:
+            return None
+        return district["total_persons"] / 100000.0
+
+    # Rankable (state_id, key, weight, count, capacity) for one state or all
+    def _entries(self, level, state_id):
+        states = [state_id] if state_id is not None else list(self.scores[level])
+        for sid in states:
+            for key, (weight, count) in self.scores[level].get(sid, {}).items():
+                capacity = self._capacity(level, sid, key)
+                if capacity is not None:
+                    yield sid, key, weight, count, capacity
+
+    def _ranking(self, level, state_id):
+        ranking = self._rankings.get((level, state_id))
+        if ranking is None:
+            ranking = sorted(
+                self._entries(level, state_id),
+                key=lambda e: e[2] / e[4],
+                reverse=True,
+            )
+            self._rankings[(level, state_id)] = ranking
+        return ranking
+
+    # The k worst hospitals or districts of a state (or of all states)
+    def top(self, level, state_id=None, k=10, now=None):
+        factor = math.exp(-self.rate * ((now or time.time()) - self.epoch))
+
+        with self._lock:
+            ranking = self._ranking(level, state_id)[:k]
+
+        results = []
+        for sid, key, weight, count, capacity in ranking:
+            score = weight * factor
+            if level == "hospital":
+                item = dict(self.hospitals[(sid, key)])
+                item["complaints_per_100_beds"] = score / capacity
+            else:
+                item = dict(self.districts[key])
+                item["complaints_per_100k"] = score / capacity
+            item["complaints"] = count
+            item["decayed_complaints"] = score
+            results.append(item)
+        return results
+
+    # Rebuild after capacity data is reloaded, and resync scores with the
+    # rollup every resync_seconds to pick up complaints written by other workers
+    def refresh(self, resync_seconds):
+        capacity_version = get_data_version(*CAPACITY_TABLES)
+        now = time.monotonic()
+
+        with self._lock:
+            if capacity_version != self.capacity_version:
+                self.load_capacity()
+                self.load_scores()
+                self.capacity_version = capacity_version
+                self.synced_at = now
+            elif now - self.synced_at > resync_seconds:
+                self.load_scores()
+                self.synced_at = now
+
+
+# One index per Flask app, refreshed on use
+def get_hotspot_index():
+    index = current_app.extensions.get("hotspot_index")
+    if index is None:
+        index = HotspotIndex(
+            half_life_days=current_app.config.get("HOTSPOT_HALF_LIFE_DAYS", 30),
+            min_beds=current_app.config.get("HOTSPOT_MIN_BEDS", 10),
+        )
+        current_app.extensions["hotspot_index"] = index
+
+    index.refresh(current_app.config.get("HOTSPOT_RESYNC_SECONDS", 60))
+    return index
+
+
+# Add a committed complaint to this worker's index, if it has been built
+def record_hotspot(complaint):
+    index = current_app.extensions.get("hotspot_index")
+    if index is not None and index.capacity_version is not None:
+        index.add_complaint(complaint)
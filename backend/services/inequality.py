@@ -0,0 +1,67 @@
+import numpy as np
+
+# Inequality of a resource (beds, hospitals) across population units
+# (districts or states). All functions take per-unit resource totals and
+# populations as arrays; units without population are dropped by the caller.
+
+
+# Lorenz curve: units sorted by resource per capita, cumulative population
+# share (x) against cumulative resource share (y), both starting at 0.
+def lorenz_curve(resource, population):
+    resource = np.asarray(resource, dtype=float)
+    population = np.asarray(population, dtype=float)
+
+    order = np.argsort(resource / population, kind="stable")
+    x = np.concatenate(([0.0], np.cumsum(population[order]) / population.sum()))
+
+    total = resource.sum()
+    if total > 0:
+        y = np.concatenate(([0.0], np.cumsum(resource[order]) / total))
+    else:
+        y = x.copy()
+    return x, y
+
+
+# Population-weighted Gini coefficient: 1 - 2 * area under the Lorenz curve.
+# 0 = resource shared in proportion to population, towards 1 = concentrated.
+def gini(resource, population):
+    x, y = lorenz_curve(resource, population)
+    return float(1.0 - np.sum(np.diff(x) * (y[1:] + y[:-1])))
+
+
+# Theil T index: sum of s_i * ln(s_i / p_i) over units, with s the resource
+# share and p the population share. 0 = proportional; units with no resource
+# contribute 0.
+def theil(resource, population):
+    resource = np.asarray(resource, dtype=float)
+    population = np.asarray(population, dtype=float)
+
+    total = resource.sum()
+    if total <= 0:
+        return 0.0
+
+    s = resource / total
+    p = population / population.sum()
+    mask = s > 0
+    return float(np.sum(s[mask] * np.log(s[mask] / p[mask])))
+
+
+# Gini, Theil and Lorenz curve for one resource, plus per-capita summary
+def inequality_summary(resource, population, per=10000):
+    resource = np.asarray(resource, dtype=float)
+    population = np.asarray(population, dtype=float)
+    per_capita = resource * per / population
+    x, y = lorenz_curve(resource, population)
+
+    return {
+        "gini": gini(resource, population),
+        "theil": theil(resource, population),
+        "per": per,
+        "overall_per_capita": float(resource.sum() * per / population.sum()),
+        "min_per_capita": float(per_capita.min()),
+        "max_per_capita": float(per_capita.max()),
+        "lorenz": {
+            "population_share": x.round(6).tolist(),
+            "resource_share": y.round(6).tolist(),
+        },
+    }
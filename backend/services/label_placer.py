@@ -0,0 +1,48 @@
+from math import floor
+
+
+# Greedy label decluttering for scatter plots.
+# A point gets a label unless an already labelled point lies within
+# (x_tol, y_tol) of it. Labelled points are bucketed in a uniform grid whose
+# cells are x_tol by y_tol, so each check only looks at the 3x3 block of
+# neighbouring cells: O(1) amortized per point instead of a scan over every
+# label placed so far.
+class LabelGrid:
+    def __init__(self, x_tol, y_tol):
+        self.x_tol = x_tol
+        self.y_tol = y_tol
+        self._cells = {}
+
+    def _cell(self, x, y):
+        return floor(x / self.x_tol), floor(y / self.y_tol)
+
+    def is_free(self, x, y):
+        cx, cy = self._cell(x, y)
+        for i in (cx - 1, cx, cx + 1):
+            for j in (cy - 1, cy, cy + 1):
+                for (px, py) in self._cells.get((i, j), ()):
+                    if abs(x - px) < self.x_tol and abs(y - py) < self.y_tol:
+                        return False
+        return True
+
+    def add(self, x, y):
+        self._cells.setdefault(self._cell(x, y), []).append((x, y))
+
+    def try_place(self, x, y):
+        if not self.is_free(x, y):
+            return False
+        self.add(x, y)
+        return True
+
+
+# Indices of the points to label, in input order. Tolerances are a fraction
+# of each axis' data range (3% by default, matching the original charts).
+def declutter_labels(xs, ys, tol=0.03):
+    if not xs:
+        return []
+
+    x_range = max(max(xs) - min(xs), 1)
+    y_range = max(max(ys) - min(ys), 1)
+    grid = LabelGrid(tol * x_range, tol * y_range)
+
+    return [i for i, (x, y) in enumerate(zip(xs, ys)) if grid.try_place(x, y)]
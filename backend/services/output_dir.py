@@ -0,0 +1,43 @@
+import json
+import os
+
+# Helpers for seed scripts that write content-hashed files plus a manifest into
+# a directory (pre-rendered charts, grouped hospital snapshots). They only ever
+# remove files the script itself wrote, so --out can't wipe unrelated files.
+
+
+# Files referenced by the manifest at path (entries under section with a
+# "file"), or an empty set if there is no readable manifest
+def manifest_files(path, section):
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f).get(section, {})
+    except (OSError, ValueError, AttributeError):
+        return set()
+    return {
+        e["file"] for e in entries.values()
+        if isinstance(e, dict) and isinstance(e.get("file"), str) and os.path.basename(e["file"]) == e["file"]
+    }
+
+
+# Raise ValueError if out_dir has files but no manifest_name, i.e. it was not
+# written by one of these scripts
+def check_output_dir(out_dir, manifest_name):
+    if not os.path.isdir(out_dir) or os.path.exists(os.path.join(out_dir, manifest_name)):
+        return
+    if os.listdir(out_dir):
+        raise ValueError(f"{out_dir} is not empty and has no {manifest_name}; refusing to write into it")
+
+
+# Remove files not in keep that this script wrote: those listed in the previous
+# manifest, or named like pattern (left behind by an interrupted run). Anything
+# else in the directory is left alone. Returns the number of files removed.
+def prune_output_dir(out_dir, keep, previous, pattern):
+    removed = 0
+    for filename in os.listdir(out_dir):
+        if filename in keep:
+            continue
+        if filename in previous or pattern.fullmatch(filename):
+            os.remove(os.path.join(out_dir, filename))
+            removed += 1
+    return removed
@@ -0,0 +1,104 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import DateTime, tuple_
+
+from extensions import db
+
+# How a paginated listing reports its total:
+#   exact    - COUNT(*) over the filtered set (rescans it on every page)
+#   estimate - the planner's row estimate for the filtered query (no scan)
+#   none     - no total
+COUNT_MODES = ("exact", "estimate", "none")
+
+
+# Opaque cursor for keyset pagination: the sort key and primary key of the last
+# row of a page, plus the ordering it belongs to so it can't be replayed
+# against a different one.
+def encode_cursor(order, values):
+    payload = {
+        "o": order,
+        "k": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+# Key values from a cursor made by encode_cursor() for the same order and
+# columns. Raises ValueError for anything else.
+def decode_cursor(cursor, order, columns):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(payload, dict) or payload.get("o") != order:
+        raise ValueError("Cursor does not match the requested ordering")
+    values = payload.get("k")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+
+    return [_cursor_value(column, value) for column, value in zip(columns, values)]
+
+
+# A cursor key value converted to (and checked against) its column's type
+def _cursor_value(column, value):
+    if value is None:
+        return None
+
+    if isinstance(column.type, DateTime):
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError("Invalid cursor")
+
+    expected = column.type.python_type
+    if isinstance(value, bool) and expected is not bool:
+        raise ValueError("Invalid cursor")
+    if expected is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, expected):
+        raise ValueError("Invalid cursor")
+    return value
+
+
+# One page of query ordered by columns (sort key first, primary key last), all
+# in the same direction, starting after the row whose key is after. Uses a row
+# comparison so a matching composite index serves any page as fast as the
+# first. offset is only for legacy page-number requests. Returns (rows, has_next).
+def keyset_page(query, columns, descending=False, after=None, page_size=20, offset=0):
+    if after is not None:
+        key, bound = tuple_(*columns), tuple_(*after)
+        query = query.filter(key < bound if descending else key > bound)
+
+    order = [c.desc() if descending else c.asc() for c in columns]
+    query = query.order_by(*order)
+    if offset:
+        query = query.offset(offset)
+    rows = query.limit(page_size + 1).all()
+    return rows[:page_size], len(rows) > page_size
+
+
+# Planner estimate of the number of rows a query returns, from EXPLAIN
+def estimate_count(query):
+    stmt = query.order_by(None).statement
+    compiled = stmt.compile(dialect=db.engine.dialect)
+    plan = db.session.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+# Total for a listing in the given COUNT_MODES mode (None for "none")
+def listing_total(query, mode):
+    if mode == "exact":
+        return query.order_by(None).count()
+    if mode == "estimate":
+        return estimate_count(query)
+    return None
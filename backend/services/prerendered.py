@@ -0,0 +1,87 @@
+import json
+import os
+import re
+import threading
+from hashlib import sha256
+
+from flask import current_app
+
+from services.output_dir import check_output_dir, manifest_files, prune_output_dir
+
+MANIFEST_NAME = "manifest.json"
+# Names of the files write_artifacts() writes: <name>.<digest>.<ext>
+ARTIFACT_FILE_RE = re.compile(r"[\w.-]+\.[0-9a-f]{16}\.[a-z]+")
+
+# Process-local copy of the manifest, reloaded when the file's mtime changes
+_manifest = {"path": None, "mtime": None, "charts": {}}
+_lock = threading.Lock()
+
+
+def _manifest_path(out_dir=None):
+    return os.path.join(out_dir or current_app.config["CHART_PRERENDER_DIR"], MANIFEST_NAME)
+
+
+def _load_manifest():
+    path = _manifest_path()
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+
+    with _lock:
+        if _manifest["path"] != path or _manifest["mtime"] != mtime:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    charts = json.load(f).get("charts", {})
+            except (OSError, ValueError):
+                charts = {}
+            _manifest.update(path=path, mtime=mtime, charts=charts)
+        return _manifest["charts"]
+
+
+# Look up a pre-rendered chart by its cache key (see api.charts.chart_cache_key).
+# Keys embed the data version, so artifacts from before a data load never match.
+# Returns (body, mimetype) or None.
+def get_prerendered(key):
+    entry = _load_manifest().get(key)
+    if entry is None:
+        return None
+
+    path = os.path.join(os.path.dirname(_manifest_path()), entry["file"])
+    try:
+        with open(path, "rb") as f:
+            return f.read(), entry["mimetype"]
+    except OSError:
+        return None
+
+
+# Write chart artifacts as content-hashed files plus a manifest mapping cache
+# keys to them. The manifest is replaced atomically, then chart files no longer
+# referenced by it are removed (see services.output_dir.prune_output_dir).
+# Raises ValueError for a non-empty directory without a manifest.
+# artifacts: iterable of dicts with key, name, ext, mimetype, body
+def write_artifacts(out_dir, artifacts, data_version):
+    check_output_dir(out_dir, MANIFEST_NAME)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = _manifest_path(out_dir)
+    previous = manifest_files(manifest_path, "charts")
+
+    charts = {}
+    for a in artifacts:
+        digest = sha256(a["body"]).hexdigest()[:16]
+        filename = f"{a['name']}.{digest}.{a['ext']}"
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(a["body"])
+        charts[a["key"]] = {"file": filename, "mimetype": a["mimetype"], "bytes": len(a["body"])}
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"data_version": data_version, "charts": charts}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+    keep = {entry["file"] for entry in charts.values()} | {MANIFEST_NAME}
+    removed = prune_output_dir(out_dir, keep, previous, ARTIFACT_FILE_RE)
+
+    return charts, removed
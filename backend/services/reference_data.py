@@ -0,0 +1,105 @@
+import threading
+
+from flask import current_app
+
+from models import State, District, Category
+from data_version import get_data_version
+from json_provider import JSONFragment
+
+# Loaders bump these when reference data is (re)seeded
+REFERENCE_TABLES = ("state", "district", "category")
+
+
+# In-memory copy of the state, district and category tables, serialized once
+# and indexed by id and by state. Response bodies are rendered to JSON bytes
+# on first use and reused until the data version changes.
+class ReferenceData:
+    def __init__(self, version):
+        self.version = version
+
+        states = State.query.order_by(State.state_name.asc()).all()
+        self.states = [s.to_dict() for s in states]
+        self.states_by_id = {s["state_id"]: s for s in self.states}
+
+        districts = District.query.order_by(District.state_id.asc(), District.district_id.asc()).all()
+        self.districts = []
+        self.districts_by_id = {}
+        self.districts_by_state = {}
+        for d in districts:
+            state = self.states_by_id.get(d.state_id)
+            row = {**d.to_dict(), "state_name": state["state_name"] if state else None}
+            self.districts.append(row)
+            self.districts_by_id[row["district_id"]] = row
+            self.districts_by_state.setdefault(row["state_id"], []).append(row)
+
+        categories = Category.query.order_by(Category.category_name.asc()).all()
+        self.categories = [c.to_dict() for c in categories]
+        self.categories_by_id = {c["category_id"]: c for c in self.categories}
+
+        self._bodies = {}
+        self._fragments = {}
+        self._lock = threading.Lock()
+
+    # Districts filtered like /api/districts: by state, by id, or both
+    def find_districts(self, state_id=None, district_id=None):
+        if district_id:
+            row = self.districts_by_id.get(district_id)
+            if row is None or (state_id and row["state_id"] != state_id):
+                return []
+            return [row]
+        if state_id:
+            return self.districts_by_state.get(state_id, [])
+        return self.districts
+
+    # Pre-encoded State.to_dict() / District.to_dict() for nesting in other
+    # documents (see json_provider.JSONFragment); None if the id is unknown
+    def state_fragment(self, state_id):
+        return self._fragment(("state", state_id), self.states_by_id.get(state_id))
+
+    def district_fragment(self, district_id):
+        row = self.districts_by_id.get(district_id)
+        if row is not None:
+            row = {k: v for k, v in row.items() if k != "state_name"}
+        return self._fragment(("district", district_id), row)
+
+    def _fragment(self, key, row):
+        if row is None:
+            return None
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            fragment = JSONFragment(current_app.json.dumps(row, separators=(",", ":")))
+            self._fragments[key] = fragment
+        return fragment
+
+    # JSON bytes for key, built by build() on first use. Serialized with the
+    # app's JSON provider so the body is identical to jsonify(build()).
+    def body(self, key, build):
+        body = self._bodies.get(key)
+        if body is None:
+            body = current_app.json.response(build()).get_data()
+            with self._lock:
+                self._bodies.setdefault(key, body)
+        return body
+
+    # Response with the cached body for key
+    def response(self, key, build, status=200):
+        return current_app.response_class(self.body(key, build), status=status, mimetype="application/json")
+
+
+_reference_lock = threading.Lock()
+
+
+# Reference data for the current data version, loaded once per version per app
+def get_reference_data():
+    version = get_data_version(*REFERENCE_TABLES)
+    data = current_app.extensions.get("reference_data")
+    if data is not None and data.version == version:
+        return data
+
+    with _reference_lock:
+        data = current_app.extensions.get("reference_data")
+        if data is None or data.version != version:
+            data = ReferenceData(version)
+            current_app.extensions["reference_data"] = data
+    return data
+
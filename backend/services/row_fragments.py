@@ -0,0 +1,101 @@
+import threading
+
+from flask import current_app
+from sqlalchemy import select
+
+from extensions import db
+from models import Hospital, Category, hospital_category
+from data_version import get_data_version
+from json_provider import JSONFragment
+from services.reference_data import get_reference_data
+
+# Tables a serialized hospital document depends on
+HOSPITAL_TABLES = ("state", "district", "hospital", "hospital_category", "category")
+
+# Hospitals loaded per query when filling the cache
+LOAD_CHUNK_SIZE = 1000
+
+
+# Pre-encoded hospital documents keyed by (state_id, hospital_id), for the
+# current data version: the full /api/hospitals document (with nested state,
+# district and categories) and the flat Hospital.to_dict() of /compact.
+# Filled on demand, so a listing only loads and encodes hospitals not seen
+# since the last data load.
+class HospitalFragments:
+    def __init__(self, version):
+        self.version = version
+        self.documents = {}
+        self.compact = {}
+        self._lock = threading.Lock()
+
+    # Fragments for keys, in order
+    def get(self, keys, compact=False):
+        cache = self.compact if compact else self.documents
+        missing = [k for k in keys if k not in cache]
+        if missing:
+            self._load(missing, compact)
+        return [cache[k] for k in keys if k in cache]
+
+    # Loads per state with a plain hospital_id IN list; a (state_id,
+    # hospital_id) row-value IN plans as one index probe per key
+    def _load(self, keys, compact):
+        dumps = current_app.json.dumps
+        ref = None if compact else get_reference_data()
+
+        by_state = {}
+        for state_id, hospital_id in keys:
+            by_state.setdefault(state_id, []).append(hospital_id)
+
+        for state_id, hospital_ids in by_state.items():
+            for start in range(0, len(hospital_ids), LOAD_CHUNK_SIZE):
+                chunk = hospital_ids[start:start + LOAD_CHUNK_SIZE]
+                hospitals = Hospital.query.filter(
+                    Hospital.state_id == state_id, Hospital.hospital_id.in_(chunk)
+                ).all()
+                categories = {} if compact else fetch_categories(state_id, chunk)
+
+                encoded = {}
+                for h in hospitals:
+                    doc = h.to_dict()
+                    if not compact:
+                        doc["state"] = ref.state_fragment(h.state_id)
+                        doc["district"] = ref.district_fragment(h.district_id)
+                        doc["categories"] = categories.get(h.hospital_id, [])
+                    encoded[(h.state_id, h.hospital_id)] = JSONFragment(dumps(doc, separators=(",", ":")))
+
+                with self._lock:
+                    (self.compact if compact else self.documents).update(encoded)
+
+
+# Categories of some hospitals of one state, by category_id:
+# {hospital_id: [category dict]}
+def fetch_categories(state_id, hospital_ids):
+    rows = db.session.execute(
+        select(hospital_category.c.hospital_id, Category)
+        .join(Category, Category.category_id == hospital_category.c.category_id)
+        .where(hospital_category.c.state_id == state_id, hospital_category.c.hospital_id.in_(hospital_ids))
+        .order_by(hospital_category.c.category_id)
+    ).all()
+
+    categories = {}
+    for hospital_id, category in rows:
+        categories.setdefault(hospital_id, []).append(category.to_dict())
+    return categories
+
+
+_fragments_lock = threading.Lock()
+
+
+# Fragment cache for the current data version, one per app
+def get_hospital_fragments():
+    version = get_data_version(*HOSPITAL_TABLES)
+    fragments = current_app.extensions.get("hospital_fragments")
+    if fragments is not None and fragments.version == version:
+        return fragments
+
+    with _fragments_lock:
+        fragments = current_app.extensions.get("hospital_fragments")
+        if fragments is None or fragments.version != version:
+            fragments = HospitalFragments(version)
+            current_app.extensions["hospital_fragments"] = fragments
+    return fragments
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+# Ensure tests can import the backend modules (app, models, services, ...)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+# The Flask app against the configured database; tests using it are skipped
+# when the database is unreachable or not seeded
+@pytest.fixture(scope="session")
+def app():
+    from sqlalchemy.exc import OperationalError
+
+    from app import app as flask_app
+    from models import Hospital
+
+    try:
+        with flask_app.app_context():
+            seeded = Hospital.query.first() is not None
+    except OperationalError:
+        pytest.skip("database is not available")
+    if not seeded:
+        pytest.skip("database is not seeded")
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+# A state that has hospitals
+@pytest.fixture(scope="session")
+def state_id(app):
+    from models import Hospital
+
+    with app.app_context():
+        return Hospital.query.first().state_id
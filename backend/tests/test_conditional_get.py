@@ -0,0 +1,61 @@
+def test_revalidation_returns_304_with_same_validator(client):
+    response = client.get("/api/states")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "Accept" in response.headers.getlist("Vary")
+
+    revalidated = client.get("/api/states", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.data == b""
+
+
+def test_if_modified_since(client):
+    last_modified = client.get("/api/categories").headers["Last-Modified"]
+    assert client.get("/api/categories", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+
+def test_stale_etag_gets_full_body(client):
+    response = client.get("/api/states", headers={"If-None-Match": 'W/"stale"'})
+    assert response.status_code == 200
+    assert response.get_json()["count"] > 0
+
+
+def test_etag_varies_with_url_and_accept(client, state_id):
+    url = f"/api/hospitals/?state_id={state_id}"
+    as_json = client.get(url).headers["ETag"]
+    as_ndjson = client.get(url, headers={"Accept": "application/x-ndjson"}).headers["ETag"]
+    other_url = client.get(url + "&fields=hospital_id").headers["ETag"]
+    assert len({as_json, as_ndjson, other_url}) == 3
+
+
+def test_views_with_own_etag_keep_a_single_validator(client, state_id):
+    for url in ("/api/charts/states-beds?format=json", f"/api/hospitals/grouped/?state_id={state_id}"):
+        etag = client.get(url).headers["ETag"]
+        revalidated = client.get(url, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == etag
+
+
+def test_post_is_not_short_circuited(client):
+    response = client.post("/api/complaints/", json={}, headers={"If-None-Match": "*"})
+    assert response.status_code == 400
+
+
+def test_bump_drops_version_snapshot_only_after_commit(app):
+    import data_version
+    from extensions import db
+    from models import DataVersion
+
+    with app.app_context():
+        try:
+            data_version.get_data_version("test_table")
+            data_version.bump_data_version("test_table")
+            assert data_version._snapshot["fetched_at"] is not None
+
+            db.session.commit()
+            assert data_version._snapshot["fetched_at"] is None
+            assert data_version.get_data_version("test_table") == "test_table:1"
+        finally:
+            DataVersion.query.filter_by(table_name="test_table").delete()
+            db.session.commit()
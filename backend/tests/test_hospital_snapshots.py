@@ -0,0 +1,73 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+from services.hospital_snapshots import crc32_combine, deflate_piece, stream_snapshots
+
+STATES = [
+    {"state_id": 1, "state_name": "Goa", "districts": []},
+    {"state_id": 2, "state_name": "Kerala", "districts": [{"district_id": 5, "hospitals": ["é" * 3000]}]},
+    {"state_id": 3, "state_name": "Sikkim", "districts": []},
+]
+
+
+# Snapshot entries as encode_snapshot() builds them, without the app
+def snapshot_entry(state):
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode()
+    return {"bytes": len(raw), "crc32": zlib.crc32(raw), "deflate": deflate_piece(raw)}
+
+
+# A single gzip member: nothing left over after the first stream ends
+def inflate_single_member(body):
+    inflater = zlib.decompressobj(wbits=31)
+    data = inflater.decompress(body) + inflater.flush()
+    assert inflater.eof
+    assert inflater.unused_data == b""
+    return data
+
+
+@pytest.mark.parametrize("a, b", [(b"", b"abc"), (b"abc", b""), (b"{\"count\":3,", b"x" * 100000), (b"\x00" * 7, b"\xff" * 13)])
+def test_crc32_combine_matches_zlib(a, b):
+    assert crc32_combine(zlib.crc32(a), zlib.crc32(b), len(b)) == zlib.crc32(a + b)
+
+
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_spliced_gzip_is_one_member_equal_to_identity_body(count):
+    entries = [snapshot_entry(s) for s in STATES[:count]]
+    identity = b"".join(stream_snapshots(entries, compressed=False))
+    assert json.loads(identity) == {"count": count, "data": STATES[:count]}
+
+    body = b"".join(stream_snapshots(entries, compressed=True))
+    assert inflate_single_member(body) == identity
+    assert gzip.decompress(body) == identity
+
+
+def test_snapshots_read_from_disk_splice_the_same(tmp_path):
+    entries = []
+    for state in STATES:
+        entry = snapshot_entry(state)
+        path = tmp_path / f"state-{state['state_id']}.deflate"
+        path.write_bytes(entry.pop("deflate"))
+        entries.append({**entry, "path": str(path)})
+
+    in_memory = [snapshot_entry(s) for s in STATES]
+    assert b"".join(stream_snapshots(entries, True)) == b"".join(stream_snapshots(in_memory, True))
+    assert b"".join(stream_snapshots(entries, False)) == b"".join(stream_snapshots(in_memory, False))
+
+
+def test_grouped_gzip_response(client, state_id):
+    url = f"/api/hospitals/grouped/?state_id={state_id}"
+    identity = client.get(url, headers={"Accept-Encoding": "identity"})
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in identity.headers
+    assert inflate_single_member(compressed.data) == identity.data
+    assert json.loads(identity.data)["data"][0]["state_id"] == state_id
+
+    assert compressed.headers["ETag"] == identity.headers["ETag"][:-1] + '-gzip"'
+    assert "Accept-Encoding" in compressed.headers.getlist("Vary")
+    revalidated = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]})
+    assert revalidated.status_code == 304
@@ -0,0 +1,28 @@
+import json
+
+
+def test_ndjson_matches_json_listing(client, state_id):
+    listing = client.get(f"/api/hospitals/?state_id={state_id}").get_json()
+
+    response = client.get(f"/api/hospitals/?state_id={state_id}&format=ndjson")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+
+    body = response.get_data(as_text=True)
+    assert body.endswith("\n")
+    lines = body.split("\n")[:-1]
+    assert [json.loads(line) for line in lines] == listing["data"]
+
+
+def test_ndjson_accept_header_and_fields(client, state_id):
+    response = client.get(
+        f"/api/hospitals/?state_id={state_id}&fields=hospital_id,hospital_name",
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows and all(set(row) == {"hospital_id", "hospital_name"} for row in rows)
+
+
+def test_ndjson_no_match_is_404(client):
+    assert client.get("/api/hospitals/?state_id=-1&format=ndjson").status_code == 404
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+from flask import Flask
+
+import json_provider
+from json_provider import FastJSONProvider, JSONFragment
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def provider(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    return FastJSONProvider(Flask(__name__))
+
+
+def test_fragment_is_spliced_in(provider):
+    text = provider.dumps({"f": JSONFragment('{"x":1}'), "n": [1, 2]}, separators=(",", ":"))
+    assert text == '{"f":{"x":1},"n":[1,2]}'
+
+
+def test_string_cannot_spoof_a_fragment(provider):
+    obj = {"f": JSONFragment('"REAL"'), "u": "\x00fragment:0\x00"}
+    assert json.loads(provider.dumps(obj, separators=(",", ":"))) == {"f": "REAL", "u": "\x00fragment:0\x00"}
+
+
+def test_out_of_range_placeholder_is_plain_data(provider):
+    obj = {"f": JSONFragment("1"), "u": "\x00fragment:99\x00"}
+    assert json.loads(provider.dumps(obj)) == {"f": 1, "u": "\x00fragment:99\x00"}
+
+
+def test_indented_output_matches_json(provider):
+    obj = {"b": [1, {"c": None}], "a": "x", "e": {}, "l": []}
+    assert provider.dumps(obj, indent=2) == json.dumps(obj, indent=2, sort_keys=True)
+
+    text = provider.dumps({"b": JSONFragment("[1]"), "a": [True]}, indent=2)
+    assert json.loads(text) == {"a": [True], "b": [1]}
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+
+from models import Complaint, Hospital
+from services.pagination import decode_cursor, encode_cursor
+
+COMPLAINT_COLUMNS = (Complaint.created_at, Complaint.complaint_id)
+
+
+def test_cursor_round_trip():
+    key = [datetime(2024, 5, 1, 12, 30, 15, 250), 42]
+    cursor = encode_cursor("created_at:desc", key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "created_at:desc", COMPLAINT_COLUMNS) == key
+
+    key = ["Apollo", 18, 7]
+    columns = (Hospital.hospital_name, Hospital.state_id, Hospital.hospital_id)
+    assert decode_cursor(encode_cursor("hospital_name:asc", key), "hospital_name:asc", columns) == key
+
+
+@pytest.mark.parametrize("cursor, order", [
+    ("not a cursor!", "created_at:desc"),
+    (encode_cursor("created_at:asc", [datetime(2024, 5, 1), 1]), "created_at:desc"),
+    (encode_cursor("created_at:desc", [datetime(2024, 5, 1)]), "created_at:desc"),
+    (encode_cursor("created_at:desc", ["yesterday", 1]), "created_at:desc"),
+    (encode_cursor("created_at:desc", [datetime(2024, 5, 1), "1"]), "created_at:desc"),
+    (encode_cursor("created_at:desc", [datetime(2024, 5, 1), True]), "created_at:desc"),
+])
+def test_decode_rejects_tampered_cursors(cursor, order):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, order, COMPLAINT_COLUMNS)
+
+
+@pytest.mark.parametrize("url", [
+    "/api/complaints/?cursor=bm90IGpzb24",
+    "/api/hospitals/?cursor=bm90IGpzb24",
+    "/api/complaints/?order_by=title&cursor=" + encode_cursor("created_at:desc", [datetime(2024, 5, 1), 1]),
+])
+def test_bad_cursor_is_400(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+# Follow next_cursor from the first page until the last; returns every row
+def walk_pages(client, url):
+    rows, cursor = [], None
+    while True:
+        page = client.get(url + (f"&cursor={cursor}" if cursor else "")).get_json()
+        rows.extend(page["data"])
+        cursor = page["pagination"]["next_cursor"]
+        assert (cursor is not None) == page["pagination"]["has_next"]
+        if cursor is None:
+            return rows
+
+
+def test_hospital_pages_cover_listing(client, state_id):
+    listing = client.get(f"/api/hospitals/?state_id={state_id}").get_json()["data"]
+    pages = walk_pages(client, f"/api/hospitals/?state_id={state_id}&page_size=500")
+    assert pages == listing
+
+
+@pytest.mark.parametrize("order_dir", ["desc", "asc"])
+def test_complaint_pages_cover_listing(client, order_dir):
+    listing = client.get(f"/api/complaints/?page_size=100&order_dir={order_dir}").get_json()["data"]
+    if len(listing) < 3:
+        pytest.skip("needs at least three complaints")
+
+    pages = walk_pages(client, f"/api/complaints/?page_size=2&order_dir={order_dir}")
+    ids = [c["complaint_id"] for c in pages]
+    assert len(ids) == len(set(ids))
+    assert ids == [c["complaint_id"] for c in listing]